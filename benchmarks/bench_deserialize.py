@@ -0,0 +1,46 @@
+"""
+Mesure le nombre de tâches désérialisées par seconde depuis des dictionnaires JSON.
+
+Compare from_dict (avec validation), from_trusted_dict et from_trusted_dicts (par lot).
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_deserialize [nombre_de_tâches]
+"""
+import gc
+import json
+import sys
+import time
+
+from benchmarks.bench_storage_format import make_tasks
+from models.task import Task
+
+DEFAULT_COUNT = 100_000
+
+
+def best_time(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()  # Chaque mesure part d'un tas propre
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+        del result
+    return best
+
+
+def main(count: int):
+    # Dictionnaires tels que relus depuis le fichier
+    records = json.loads(json.dumps([task.to_dict() for task in make_tasks(count)]))
+
+    variants = (
+        ("from_dict", lambda: [Task.from_dict(data) for data in records]),
+        ("from_trusted_dict", lambda: [Task.from_trusted_dict(data) for data in records]),
+        ("from_trusted_dicts", lambda: Task.from_trusted_dicts(records)),
+    )
+    for name, func in variants:
+        elapsed = best_time(func)
+        print(f"{name:<20} {count / elapsed:>12,.0f} tâches/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
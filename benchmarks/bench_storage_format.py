@@ -0,0 +1,72 @@
+"""
+Compare le format JSON et le format binaire : taille du fichier et temps de chargement.
+
+Usage (depuis la racine du projet) :
+    python -m benchmarks.bench_storage_format [nombre_de_tâches]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from models.comment import Comment
+from models.task import Task, TaskState
+from models.task_repository import TaskRepository
+
+DEFAULT_COUNT = 100_000
+
+
+def make_tasks(count: int):
+    """Génère des tâches réalistes (un tiers avec commentaires, un quart clôturées)"""
+    start = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(count):
+        task = Task(
+            title=f"Tâche n°{i} à traiter",
+            description=f"Description de la tâche {i}, avec quelques détails supplémentaires",
+            start_date=start + timedelta(hours=i),
+        )
+        if i % 4 == 0:
+            task.close_task()
+        elif i % 7 == 0 and tasks:
+            task.state = TaskState.WAITING
+            task.waiting_for = tasks[-1].id
+        if i % 3 == 0:
+            task.add_comment(Comment(f"Commentaire sur la tâche {i}"))
+        tasks.append(task)
+    return tasks
+
+
+def measure_load(path: str, repeat: int = 3) -> float:
+    """Meilleur temps de chargement complet à froid (nouvelle instance à chaque fois)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        TaskRepository(path).load_all()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count: int):
+    directory = tempfile.mkdtemp(prefix="pytasks-bench-")
+    try:
+        json_path = os.path.join(directory, "tasks.json")
+        binary_path = os.path.join(directory, "tasks.bin")
+
+        print(f"Génération de {count} tâches...")
+        TaskRepository(json_path).save_many(make_tasks(count))
+        shutil.copyfile(json_path, binary_path)
+        TaskRepository(binary_path).convert("binary")
+
+        print(f"{'Format':<8} {'Taille':>12} {'Chargement':>12}")
+        for name, path in (("json", json_path), ("binary", binary_path)):
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{name:<8} {size:>9.1f} Mo {measure_load(path):>10.2f} s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
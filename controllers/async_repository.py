@@ -0,0 +1,116 @@
+"""
+Façade asynchrone du repository.
+
+Les lectures et écritures s'exécutent sur un thread dédié pour ne jamais
+bloquer la boucle d'événements Qt ; les résultats reviennent par signaux
+(connexion en file d'attente vers le thread de l'interface).
+
+Propriété des objets Task : le thread de travail est le seul à modifier les
+tâches du repository (via TaskRepository.modify, dans une opération soumise) ;
+le thread de l'interface ne fait que les lire pour l'affichage.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, Signal
+
+from models.task import TaskState
+from models.task_repository import TaskRepository
+
+
+class AsyncTaskRepository(QObject):
+    """
+    Exécute les opérations du repository sur un unique thread de travail.
+    Un seul thread : les opérations s'exécutent dans l'ordre de soumission,
+    donc deux sauvegardes d'une même tâche ne se chevauchent jamais.
+    """
+
+    tasks_loaded = Signal(list)           # Résultat de load_all
+    search_finished = Signal(list)        # Résultat de la dernière recherche
+    operation_failed = Signal(str, str)   # Opération, message d'erreur
+    _finished = Signal(object, object)    # Rappel, résultat (cf. submit)
+
+    def __init__(self, repository: TaskRepository):
+        super().__init__()
+        self.repository = repository
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repository")
+
+        # Seule la recherche la plus récente est renvoyée
+        self._search_generation = 0
+
+        # Fermeture en cours (cf. shutdown) : les opérations s'exécutent sur place
+        self._closed = False
+
+        # Émis depuis le thread de travail : le rappel s'exécute sur le thread de l'interface
+        self._finished.connect(self._deliver)
+
+    def _submit(self, operation: str, func: Callable, on_result: Optional[Callable] = None):
+        """Exécute func sur le thread de travail et transmet le résultat"""
+        def run():
+            try:
+                result = func()
+            except Exception as e:
+                self.operation_failed.emit(operation, str(e))
+                return
+            if on_result:
+                on_result(result)
+
+        if self._closed:
+            run()  # Soumise par un rappel livré pendant shutdown
+            return
+        self._executor.submit(run)
+
+    def submit(self, operation: str, func: Callable, on_result: Optional[Callable] = None):
+        """
+        Exécute func sur le thread de travail, à la suite des opérations déjà soumises.
+        on_result(résultat) est ensuite appelé sur le thread de l'interface ;
+        une exception est transmise par operation_failed.
+
+        Args:
+            operation: Nom de l'opération (messages d'erreur)
+            func: Fonction sans argument, exécutée sur le thread de travail
+            on_result: Rappel recevant le résultat (optionnel)
+        """
+        if on_result is None:
+            self._submit(operation, func)
+        else:
+            self._submit(operation, func, lambda result: self._finished.emit(on_result, result))
+
+    def _deliver(self, on_result: Callable, result):
+        on_result(result)
+
+    # ========== LECTURE ==========
+
+    def load_all(self):
+        """Charge toutes les tâches → tasks_loaded"""
+        self._submit("load_all", self.repository.load_all, self.tasks_loaded.emit)
+
+    def search(self, query: str, state_filter: Optional[TaskState] = None, include_archive: bool = False):
+        """Recherche → search_finished (les recherches dépassées sont abandonnées)"""
+        self._search_generation += 1
+        generation = self._search_generation
+
+        def run():
+            if generation != self._search_generation:
+                return None  # Une recherche plus récente a été demandée
+            return self.repository.search(query, state_filter, include_archive=include_archive)
+
+        def on_result(results):
+            if results is not None and generation == self._search_generation:
+                self.search_finished.emit(results)
+
+        self._submit("search", run, on_result)
+
+    def shutdown(self):
+        """
+        Attend la fin des opérations en cours, livre leurs rappels (ex: entrée
+        d'historique d'une action tout juste terminée) puis ferme le repository
+        (écritures en attente, cache). À appeler depuis le thread de l'interface,
+        avant la fermeture du logger.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        # Rappels émis par le thread de travail, encore en file : la boucle
+        # d'événements ne tournera plus pour les livrer
+        QCoreApplication.sendPostedEvents(None, QEvent.MetaCall)
+        self.repository.close()
\ No newline at end of file
@@ -4,12 +4,13 @@ Fait le lien entre les vues (UI) et les modèles (logique métier).
 """
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QMessageBox
-from typing import Optional, List
+from typing import Callable, Optional, List
 from datetime import datetime
 
 from models.task import Task, TaskState
 from models.comment import Comment
 from models.task_repository import TaskRepository
+from controllers.async_repository import AsyncTaskRepository
 from utils.logger import Logger
 
 
@@ -17,39 +18,151 @@ class TaskController(QObject):
     """
     Contrôleur principal gérant la logique de l'application.
     Hérite de QObject pour pouvoir émettre des signaux Qt.
+
+    Avec la façade asynchrone, toutes les opérations sur le repository (et
+    toutes les modifications de tâches) s'exécutent sur son thread de travail ;
+    leurs suites (historique, signaux) sur le thread de l'interface. Une tâche
+    modifiée est redessinée par task_changed ; la liste n'est rechargée que
+    si son contenu change (création, suppression).
     """
     
     # Signaux pour notifier la vue des changements
     tasks_updated = Signal()  # Émis quand la liste change
     task_selected = Signal(Task)  # Émis quand une tâche est sélectionnée
+    task_changed = Signal(Task, object)  # Émis après l'écriture d'une tâche, avec ses champs modifiés
+    tasks_unblocked = Signal(list)  # Émis avec les tâches en attente débloquées par une clôture
+    history_appended = Signal(object)  # Émis (depuis n'importe quel thread) pour chaque entrée d'historique
+    storage_error = Signal(str)  # Émis (depuis n'importe quel thread) si une écriture différée échoue
     
-    def __init__(self, repository: TaskRepository, logger: Logger):
+    def __init__(
+        self,
+        repository: TaskRepository,
+        logger: Logger,
+        async_repository: Optional[AsyncTaskRepository] = None
+    ):
+        """
+        Args:
+            repository: Repository des tâches
+            logger: Historique des actions
+            async_repository: Façade asynchrone (optionnelle) : chargements,
+                              recherches, sélections et sauvegardes passent
+                              alors par un thread de travail
+        """
         super().__init__()
         self.repository = repository
         self.logger = logger
+        self.async_repository = async_repository
         self.current_task: Optional[Task] = None
         self.tasks = []
+
+        # Contexte de la tâche sélectionnée, calculé avec elle (tâche en attente uniquement)
+        self.current_blockers: List[Task] = []  # Chaîne des tâches qui la bloquent
+        self.waiting_candidates: List[Task] = []  # Tâches qu'elle peut attendre
+
+        # Conflits entre instances détectés lors des écritures différées
+        self.storage_error.connect(self._on_storage_error)
+        repository.on_flush_error = lambda e: self.storage_error.emit(str(e))
+
+        # Nouvelles entrées d'historique, livrées au thread de l'interface par le signal
+        logger.on_entry = self.history_appended.emit
+
+        if async_repository:
+            async_repository.tasks_loaded.connect(self._on_tasks_loaded)
+            async_repository.search_finished.connect(self._on_search_finished)
+            async_repository.operation_failed.connect(self._on_operation_failed)
     
     # ========== CHARGEMENT ==========
     
     def load_tasks(self):
         """Charge toutes les tâches depuis le repository"""
+        if self.async_repository:
+            self.async_repository.load_all()
+            return
+
         try:
-            self.tasks = self.repository.load_all()
-            self.logger.log("info", f"{len(self.tasks)} tâche(s) chargée(s)")
-            self.tasks_updated.emit()
+            self._on_tasks_loaded(self.repository.load_all())
         except Exception as e:
             self.logger.log("error", f"Erreur de chargement : {str(e)}")
             self.tasks = []
+
+    def _on_tasks_loaded(self, tasks: List[Task]):
+        """Reçoit la liste des tâches chargées"""
+        self.tasks = tasks
+        self.logger.log("info", f"{len(self.tasks)} tâche(s) chargée(s)")
+        self.tasks_updated.emit()
+
+    def _on_operation_failed(self, operation: str, message: str):
+        """Erreur remontée par le thread du repository"""
+        self.logger.log("error", f"Erreur repository ({operation}) : {message}")
+        self._show_error(message)
+
+    def _on_storage_error(self, message: str):
+        """Écriture différée en échec : prévient l'utilisateur et recharge depuis le disque"""
+        self.logger.log("error", f"Erreur d'enregistrement : {message}")
+        self._show_error(message)
+
+        current_id = self.current_task.id if self.current_task else None
+        self.load_tasks()
+        if current_id:
+            self.select_task(current_id)
+
+    def _run(self, operation: str, func: Callable, on_result: Optional[Callable] = None):
+        """
+        Exécute func sur le thread de travail si disponible, sinon immédiatement ;
+        on_result(résultat) s'exécute ensuite sur le thread de l'interface.
+        """
+        if self.async_repository:
+            self.async_repository.submit(operation, func, on_result)
+            return
+
+        try:
+            result = func()
+        except Exception as e:
+            self._on_operation_failed(operation, str(e))
+            return
+        if on_result:
+            on_result(result)
+
+    def _modify(
+        self,
+        operation: str,
+        task: Task,
+        change: Callable[[Task], None],
+        on_done: Optional[Callable[[Task], None]] = None
+    ):
+        """
+        Modifie puis sauvegarde une tâche sur le thread propriétaire des tâches.
+
+        Args:
+            operation: Nom de l'opération (messages d'erreur)
+            task: Tâche à modifier
+            change: Modifications à appliquer (thread de travail)
+            on_done: Suite, appelée avec la tâche (thread de l'interface)
+        """
+        def finished(fields):
+            if fields:
+                self.task_changed.emit(task, fields)
+            if on_done:
+                on_done(task)
+
+        self._run(operation, lambda: self.repository.modify(task, change), finished)
     
     # ========== CRÉATION ==========
     
-    def create_task(self, title: str, description: str = "") -> bool:
+    def create_task(
+        self,
+        title: str,
+        description: str = "",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        state: TaskState = TaskState.TODO,
+        waiting_for: Optional[str] = None
+    ) -> bool:
         """
-        Crée une nouvelle tâche.
+        Crée une nouvelle tâche puis la sélectionne.
         
         Returns:
-            bool: True si succès, False sinon
+            bool: True si la création est lancée, False si les valeurs sont invalides
         """
         try:
             # Validation
@@ -58,24 +171,38 @@ class TaskController(QObject):
                 return False
             
             # Création
-            task = Task(title=title, description=description)
-            
-            # Sauvegarde
-            self.repository.save(task)
-            
-            # Log et notification
-            self.logger.log("info", f"Tâche créée : '{task.title}'")
-            self.load_tasks()  # Recharge la liste
-            
-            return True
+            task = Task(
+                title=title,
+                description=description,
+                start_date=start_date,
+                end_date=end_date,
+                state=state,
+                waiting_for=waiting_for
+            )
             
         except ValueError as e:
             self._show_error(f"Erreur de validation : {str(e)}")
             return False
-        except Exception as e:
-            self.logger.log("error", f"Erreur création : {str(e)}")
-            self._show_error(f"Erreur : {str(e)}")
-            return False
+
+        def run():
+            self.repository.save(task)
+            waiting_task = self.repository.find_by_id(waiting_for) if waiting_for else None
+            return waiting_task.title if waiting_task else "tâche inconnue"
+
+        def on_done(waiting_title: str):
+            # Log et notification
+            if waiting_for:
+                self.logger.log(
+                    "info", f"Tâche créée : '{task.title}' (en attente de '{waiting_title}')", "create", task.id
+                )
+            else:
+                self.logger.log("info", f"Tâche créée : '{task.title}'", "create", task.id)
+            self.load_tasks()  # Recharge la liste
+            self.select_task(task.id)
+
+        # Sauvegarde
+        self._run("create", run, on_done)
+        return True
     
     # ========== MISE À JOUR ==========
     
@@ -91,38 +218,36 @@ class TaskController(QObject):
         Met à jour la tâche actuellement sélectionnée.
         
         Returns:
-            bool: True si succès
+            bool: True si la mise à jour est lancée (valeurs valides)
         """
         if not self.current_task:
             self._show_error("Aucune tâche sélectionnée")
             return False
         
         try:
-            # Mise à jour via la méthode métier
-            self.current_task.update(
+            # Validation sur le thread de l'interface : la modification elle-même se fait au thread de travail
+            self.current_task.check_update(title, start_date, end_date)
+        except ValueError as e:
+            self._show_error(f"Validation échouée : {str(e)}")
+            return False
+
+        def on_done(task: Task):
+            self.logger.log("info", f"Tâche mise à jour : '{task.title}'", "update", task.id)
+
+        # Mise à jour via la méthode métier, puis sauvegarde
+        self._modify(
+            "update",
+            self.current_task,
+            lambda task: task.update(
                 title=title,
                 description=description,
                 start_date=start_date,
                 end_date=end_date,
                 state=state
-            )
-            
-            # Sauvegarde
-            self.repository.save(self.current_task)
-            
-            # Log
-            self.logger.log("info", f"Tâche mise à jour : '{self.current_task.title}'")
-            self.load_tasks()
-            
-            return True
-            
-        except ValueError as e:
-            self._show_error(f"Validation échouée : {str(e)}")
-            return False
-        except Exception as e:
-            self.logger.log("error", f"Erreur MAJ : {str(e)}")
-            self._show_error(f"Erreur : {str(e)}")
-            return False
+            ),
+            on_done
+        )
+        return True
         
     def set_waiting_for(self, task_id: str, waiting_for_id: Optional[str]) -> bool:
       """
@@ -132,30 +257,41 @@ class TaskController(QObject):
           task_id: ID de la tâche à modifier
           waiting_for_id: ID de la tâche dont on dépend (None pour retirer)
       """
-      try:
+      def run():
           task = self.repository.find_by_id(task_id)
           if not task:
-              return False
-          
-          task.waiting_for = waiting_for_id
-          task.updated_at = datetime.now()
-          self.repository.save(task)
-          
+              return None
+
+          if waiting_for_id and self.repository.would_create_cycle(task_id, waiting_for_id):
+              raise ValueError("Dépendance circulaire : cette tâche attend déjà, directement ou non, la tâche choisie")
+
+          def change(task: Task):
+              task.waiting_for = waiting_for_id
+              task.updated_at = datetime.now()
+
+          fields = self.repository.modify(task, change)
+          waiting_task = self.repository.find_by_id(waiting_for_id) if waiting_for_id else None
+          return task, fields, waiting_task.title if waiting_task else "tâche inconnue"
+
+      def on_done(result):
+          if result is None:
+              return
+          task, fields, waiting_title = result
+          if fields:
+              self.task_changed.emit(task, fields)
+
           if waiting_for_id:
-              waiting_task = self.repository.find_by_id(waiting_for_id)
               self.logger.log(
                   "info",
-                  f"Tâche '{task.title}' en attente de '{waiting_task.title if waiting_task else 'tâche inconnue'}'"
+                  f"Tâche '{task.title}' en attente de '{waiting_title}'",
+                  "set_waiting",
+                  task.id
               )
           else:
-              self.logger.log("info", f"Dépendance retirée de '{task.title}'")
-          
-          self.load_tasks()
-          return True
-          
-      except Exception as e:
-          self.logger.log("error", f"Erreur définition dépendance : {str(e)}")
-          return False
+              self.logger.log("info", f"Dépendance retirée de '{task.title}'", "set_waiting", task.id)
+
+      self._run("set_waiting", run, on_done)
+      return True
 
     def start_waiting_task(self) -> bool:
         """Démarre la tâche en attente actuelle (passe à TODO)"""
@@ -165,53 +301,43 @@ class TaskController(QObject):
         if self.current_task.state != TaskState.WAITING:
             return False
         
-        try:
-            self.current_task.start_task()
-            self.repository.save(self.current_task)
-            
-            self.logger.log("success", f"Tâche démarrée : '{self.current_task.title}'")
-            self.load_tasks()
-            
-            return True
-            
-        except Exception as e:
-            self.logger.log("error", f"Erreur démarrage : {str(e)}")
-            return False
+        def on_done(task: Task):
+            self.logger.log("success", f"Tâche démarrée : '{task.title}'", "start", task.id)
+
+        self._modify("start", self.current_task, lambda task: task.start_task(), on_done)
+        return True
     
     # ========== SUPPRESSION ==========
     
     def delete_task(self, task_id: str) -> bool:
         """Supprime une tâche"""
-        try:
-            task = self.repository.find_by_id(task_id)
-            if not task:
-                return False
-            
-            # Demande confirmation
-            reply = QMessageBox.question(
-                None,
-                "Confirmation",
-                f"Supprimer la tâche '{task.title}' ?",
-                QMessageBox.Yes | QMessageBox.No
-            )
-            
-            if reply == QMessageBox.Yes:
-                self.repository.delete(task_id)
-                self.logger.log("warning", f"Tâche supprimée : '{task.title}'")
-                
-                # Réinitialise la sélection
-                if self.current_task and self.current_task.id == task_id:
-                    self.current_task = None
-                
-                self.load_tasks()
-                return True
-            
+        # Tâche affichée (lecture seule) : pas d'accès au repository depuis l'interface
+        task = next((t for t in [self.current_task, *self.tasks] if t and t.id == task_id), None)
+        if not task:
             return False
-            
-        except Exception as e:
-            self.logger.log("error", f"Erreur suppression : {str(e)}")
-            self._show_error(f"Erreur : {str(e)}")
+        
+        # Demande confirmation
+        reply = QMessageBox.question(
+            None,
+            "Confirmation",
+            f"Supprimer la tâche '{task.title}' ?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply != QMessageBox.Yes:
             return False
+
+        def on_done(deleted: bool):
+            if deleted:
+                self.logger.log("warning", f"Tâche supprimée : '{task.title}'", "delete", task.id)
+            self.load_tasks()
+
+        self._run("delete", lambda: self.repository.delete(task_id), on_done)
+
+        # Réinitialise la sélection
+        if self.current_task and self.current_task.id == task_id:
+            self.current_task = None
+        return True
     
     # ========== CLÔTURE ==========
     
@@ -220,19 +346,38 @@ class TaskController(QObject):
         if not self.current_task:
             return False
         
-        try:
-            self.current_task.close_task()
-            self.repository.save(self.current_task)
-            
-            self.logger.log("success", f"Tâche clôturée : '{self.current_task.title}'")
-            self.load_tasks()
-            
-            return True
-            
-        except Exception as e:
-            self.logger.log("error", f"Erreur clôture : {str(e)}")
-            return False
+        task = self.current_task
+
+        def run():
+            fields = self.repository.modify(task, lambda t: t.close_task())
+            return fields, self._find_unblocked([task])
+
+        def on_done(result):
+            fields, unblocked = result
+            if fields:
+                self.task_changed.emit(task, fields)
+            self.logger.log("success", f"Tâche clôturée : '{task.title}'", "close", task.id)
+            self._announce_unblocked(unblocked)
+
+        self._run("close", run, on_done)
+        return True
         
+    def _find_unblocked(self, closed: List[Task]) -> List[Task]:
+        """Tâches en attente dont la dépendance vient d'être clôturée (thread de travail)"""
+        return [
+            task
+            for closed_task in closed
+            for task in self.repository.find_waiting_on(closed_task.id)
+            if task.state == TaskState.WAITING
+        ]
+
+    def _announce_unblocked(self, unblocked: List[Task]):
+        """Signale les tâches débloquées (thread de l'interface)"""
+        for task in unblocked:
+            self.logger.log("info", f"Tâche débloquée : '{task.title}'", "unblock", task.id)
+        if unblocked:
+            self.tasks_unblocked.emit(unblocked)
+
     # ========== EN COURS ==========
 
     def start_work_on_task(self) -> bool:
@@ -243,19 +388,15 @@ class TaskController(QObject):
         if self.current_task.state in [TaskState.DONE, TaskState.ABANDONED]:
             return False
         
-        try:
-            self.current_task.state = TaskState.IN_PROGRESS
-            self.current_task.updated_at = datetime.now()
-            self.repository.save(self.current_task)
-            
-            self.logger.log("info", f"Travail commencé : '{self.current_task.title}'")
-            self.load_tasks()
-            
-            return True
-            
-        except Exception as e:
-            self.logger.log("error", f"Erreur début travail : {str(e)}")
-            return False
+        def change(task: Task):
+            task.state = TaskState.IN_PROGRESS
+            task.updated_at = datetime.now()
+
+        def on_done(task: Task):
+            self.logger.log("info", f"Travail commencé : '{task.title}'", "start_work", task.id)
+
+        self._modify("start_work", self.current_task, change, on_done)
+        return True
         
     # ========== ABANDONNER ==========
 
@@ -267,23 +408,76 @@ class TaskController(QObject):
         if self.current_task.state in [TaskState.DONE, TaskState.ABANDONED]:
             return False
         
-        try:
-            self.current_task.state = TaskState.ABANDONED
-            self.current_task.end_date = datetime.now()
-            self.current_task.updated_at = datetime.now()
-            self.repository.save(self.current_task)
-            
-            self.logger.log("warning", f"Tâche abandonnée : '{self.current_task.title}'")
-            self.load_tasks()
-            
-            return True
-            
-        except Exception as e:
-            self.logger.log("error", f"Erreur abandon : {str(e)}")
-            return False
+        def change(task: Task):
+            task.state = TaskState.ABANDONED
+            task.end_date = datetime.now()
+            task.updated_at = datetime.now()
+
+        def on_done(task: Task):
+            self.logger.log("warning", f"Tâche abandonnée : '{task.title}'", "abandon", task.id)
+
+        self._modify("abandon", self.current_task, change, on_done)
+        return True
     
+    # ========== ACTIONS GROUPÉES ==========
+
+    def close_tasks(self, task_ids: List[str]):
+        """
+        Clôture plusieurs tâches en une seule écriture (tout ou rien).
+        Le nombre de tâches clôturées est noté dans l'historique.
+        """
+        def run():
+            closed = []
+            with self.repository.transaction():
+                for task_id in task_ids:
+                    task = self.repository.find_by_id(task_id)
+                    if not task or task.state in [TaskState.DONE, TaskState.ABANDONED]:
+                        continue
+                    task.close_task()
+                    # Relevé avant l'écriture, qui le remet à zéro
+                    closed.append((task, task.changes().changed_fields()))
+                self.repository.save_many(task for task, _ in closed)
+            return closed, self._find_unblocked([task for task, _ in closed])
+
+        def on_done(result):
+            closed, unblocked = result
+            for task, fields in closed:
+                self.task_changed.emit(task, fields)
+            self.logger.log("success", f"{len(closed)} tâche(s) clôturée(s)", "close")
+            self._announce_unblocked(unblocked)
+
+        self._run("close_tasks", run, on_done)
+
+    def delete_tasks(self, task_ids: List[str]):
+        """
+        Supprime plusieurs tâches après une seule confirmation.
+        Le nombre de tâches supprimées est noté dans l'historique.
+        """
+        if not task_ids:
+            return
+
+        reply = QMessageBox.question(
+            None,
+            "Confirmation",
+            f"Supprimer {len(task_ids)} tâche(s) ?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+
+        if reply != QMessageBox.Yes:
+            return
+
+        def on_done(deleted_count: int):
+            self.logger.log("warning", f"{deleted_count} tâche(s) supprimée(s)", "delete")
+            self.load_tasks()
+
+        self._run("delete_tasks", lambda: self.repository.delete_many(task_ids), on_done)
+
+        # Réinitialise la sélection
+        if self.current_task and self.current_task.id in task_ids:
+            self.current_task = None
+
     # ========== COMMENTAIRES ==========
-    
+
     def add_comment_to_current_task(self, content: str) -> bool:
         """Ajoute un commentaire à la tâche actuelle"""
         if not self.current_task:
@@ -291,17 +485,15 @@ class TaskController(QObject):
         
         try:
             comment = Comment(content=content)
-            self.current_task.add_comment(comment)
-            self.repository.save(self.current_task)
-            
-            self.logger.log("info", f"Commentaire ajouté à '{self.current_task.title}'")
-            self.task_selected.emit(self.current_task)  # Rafraîchit l'affichage
-            
-            return True
-            
         except ValueError as e:
             self._show_error(f"Commentaire invalide : {str(e)}")
             return False
+
+        def on_done(task: Task):
+            self.logger.log("info", f"Commentaire ajouté à '{task.title}'", "add_comment", task.id)
+
+        self._modify("add_comment", self.current_task, lambda task: task.add_comment(comment), on_done)
+        return True
         
     def delete_comments_from_current_task(self, comments: List) -> bool:
         """
@@ -311,46 +503,77 @@ class TaskController(QObject):
             comments: Liste des objets Comment à supprimer
             
         Returns:
-            True si au moins un commentaire a été supprimé
+            True si la suppression est lancée
         """
         if not self.current_task or not comments:
             return False
         
-        try:
-            deleted_count = self.current_task.remove_comments(comments)
-            
-            if deleted_count > 0:
-                self.repository.save(self.current_task)
-                
-                # Log différent selon le nombre
-                if deleted_count == 1:
-                    comment_content = comments[0].content[:50]  # Limite à 50 caractères
-                    self.logger.log(
-                        "warning",
-                        f"Commentaire supprimé de '{self.current_task.title}' : '{comment_content}'"
-                    )
-                else:
-                    self.logger.log(
-                        "warning",
-                        f"{deleted_count} commentaires supprimés de '{self.current_task.title}'"
-                    )
-                
-                self.task_selected.emit(self.current_task)  # Rafraîchit l'affichage
-                return True
-            
-            return False
-            
-        except Exception as e:
-            self.logger.log("error", f"Erreur suppression commentaire(s) : {str(e)}")
-            return False
+        task = self.current_task
+
+        def run():
+            deleted_count = 0
+
+            def change(task: Task):
+                nonlocal deleted_count
+                deleted_count = task.remove_comments(comments)
+
+            fields = self.repository.modify(task, change)
+            return fields, deleted_count
+
+        def on_done(result):
+            fields, deleted_count = result
+            if fields:
+                self.task_changed.emit(task, fields)
+
+            # Log différent selon le nombre
+            if deleted_count == 1:
+                comment_content = comments[0].content[:50]  # Limite à 50 caractères
+                self.logger.log(
+                    "warning",
+                    f"Commentaire supprimé de '{task.title}' : '{comment_content}'",
+                    "delete_comment",
+                    task.id
+                )
+            elif deleted_count > 1:
+                self.logger.log(
+                    "warning",
+                    f"{deleted_count} commentaires supprimés de '{task.title}'",
+                    "delete_comment",
+                    task.id
+                )
+
+        self._run("delete_comment", run, on_done)
+        return True
     
     # ========== SÉLECTION ==========
     
     def select_task(self, task_id: str):
-        """Sélectionne une tâche par son ID"""
-        task = self.repository.find_by_id(task_id)
+        """
+        Sélectionne une tâche par son ID.
+        Pour une tâche en attente, ses bloqueurs et les tâches qu'elle peut
+        attendre sont calculés en même temps (cf. current_blockers, waiting_candidates).
+        """
+        def run():
+            task = self.repository.find_by_id(task_id)
+            if not task or task.state != TaskState.WAITING:
+                return task, [], []
+            candidates = [
+                t for t in self.repository.find_by_state(
+                    TaskState.TODO, TaskState.IN_PROGRESS, TaskState.WAITING, TaskState.ABANDONED
+                )
+                if t.id != task_id
+            ]
+            return task, self.repository.find_blockers(task_id), candidates
+
+        self._run("find_by_id", run, self._on_task_found)
+
+    def _on_task_found(self, result):
+        """Reçoit la tâche à sélectionner et son contexte"""
+        task, blockers, candidates = result
         if task:
             self.current_task = task
+            self.current_blockers = blockers
+            self.waiting_candidates = candidates
             self.task_selected.emit(task)
     
     def deselect_task(self):
@@ -359,16 +582,30 @@ class TaskController(QObject):
     
     # ========== RECHERCHE & FILTRE ==========
     
-    def search_and_filter(self, query: str, state_filter: Optional[TaskState] = None):
+    def search_and_filter(
+        self,
+        query: str,
+        state_filter: Optional[TaskState] = None,
+        include_archive: bool = False
+    ):
         """
         Recherche et filtre les tâches.
         Met à jour self.tasks avec les résultats.
+        L'archive n'est lue que si include_archive ou si le filtre porte sur un état fermé.
         """
+        if self.async_repository:
+            self.async_repository.search(query, state_filter, include_archive)
+            return
+
         try:
-            self.tasks = self.repository.search(query, state_filter)
-            self.tasks_updated.emit()
+            self._on_search_finished(self.repository.search(query, state_filter, include_archive=include_archive))
         except Exception as e:
             self.logger.log("error", f"Erreur recherche : {str(e)}")
+
+    def _on_search_finished(self, tasks: List[Task]):
+        """Reçoit les résultats de recherche"""
+        self.tasks = tasks
+        self.tasks_updated.emit()
     
     # ========== UTILITAIRES ==========
     
@@ -378,4 +615,28 @@ class TaskController(QObject):
     
     def get_all_tasks(self):
         """Retourne la liste des tâches actuelles"""
-        return self.tasks
\ No newline at end of file
+        return self.tasks
+
+    def get_tasks_by_state(self, on_result: Callable[[List[Task]], None], *states: TaskState):
+        """Transmet à on_result les tâches dans l'un des états donnés (index du repository)"""
+        self._run("find_by_state", lambda: self.repository.find_by_state(*states), on_result)
+
+    def get_tasks_waiting_on(self, task_id: str, on_result: Callable[[List[Task]], None]):
+        """Transmet à on_result les tâches qui attendent la tâche donnée"""
+        self._run("find_waiting_on", lambda: self.repository.find_waiting_on(task_id), on_result)
+
+    def get_statistics(self, on_result: Callable[[dict], None]):
+        """
+        Statistiques sur l'ensemble des tâches (calculées sur les colonnes du repository),
+        transmises à on_result sous la forme :
+            {"by_state": {TaskState: nombre}, "overdue": nombre,
+             "average_cycle_time": timedelta ou None}
+        """
+        def run():
+            return {
+                "by_state": self.repository.count_by_state(include_archive=True),
+                "overdue": len(self.repository.find_overdue()),
+                "average_cycle_time": self.repository.average_cycle_time(include_archive=True)
+            }
+
+        self._run("statistics", run, on_result)
@@ -3,13 +3,16 @@ Point d'entrée de l'application PyTasks.
 """
 import sys
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
 
 from models.task_repository import TaskRepository
 from controllers.task_controller import TaskController
+from controllers.async_repository import AsyncTaskRepository
 from main_window import MainWindow
 from utils.logger import Logger
 
+# Âge (en jours) au-delà duquel une tâche clôturée est archivée
+ARCHIVE_AFTER_DAYS = 30
+
 
 def main():
     """Fonction principale de l'application"""
@@ -28,24 +31,32 @@ def main():
             print("⚠️  Fichier styles.qss non trouvé, thème par défaut utilisé")
   
         # Initialise les composants
-        repository = TaskRepository("tasks.json")
+        # Write-behind : au plus une écriture disque par rafale de modifications ;
+        # cache de démarrage : pas de re-parsing tant que tasks.json n'a pas changé
+        repository = TaskRepository("tasks.json", flush_delay=0.5, snapshot_cache=True)
+        
+        # Les tâches clôturées depuis longtemps quittent le jeu actif
+        archived = repository.archive_closed_tasks(ARCHIVE_AFTER_DAYS)
+        if archived:
+            print(f"📦 {archived} tâche(s) archivée(s)")
+        
+        # Les accès disque se font hors du thread de l'interface
+        async_repository = AsyncTaskRepository(repository)
+        # Termine les opérations et livre leurs rappels puis ferme ; connecté avant
+        # logger.close : les actions terminées à la fermeture sont encore journalisées
+        app.aboutToQuit.connect(async_repository.shutdown)
         
-        logger = Logger()
+        # Historique traité hors du thread de l'interface, écrit par paquets en fin de fichier ;
+        # la fermeture attend les entrées encore en file
+        logger = Logger(background=True)
+        app.aboutToQuit.connect(logger.close)
         
-        controller = TaskController(repository, logger)
+        controller = TaskController(repository, logger, async_repository)
         
         # Crée la fenêtre principale
         window = MainWindow(controller)
         
         window.show()
-        
-        # Timer pour rafraîchir l'historique
-        def refresh_history():
-            window.update_history_display()
-        
-        timer = QTimer()
-        timer.timeout.connect(refresh_history)
-        timer.start(2000)
 
         print("✅ Application créée")
         
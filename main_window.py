@@ -4,11 +4,16 @@ Connecte l'interface utilisateur au contrôleur.
 """
 from PySide6.QtWidgets import QMainWindow, QListWidgetItem, QInputDialog, QMessageBox
 from PySide6.QtCore import Qt, Slot
+from PySide6.QtGui import QTextCursor
 from datetime import datetime
 
 from views.ui_main import Ui_MainWindow
 from controllers.task_controller import TaskController
 from models.task import Task, TaskState
+from utils.logger import LogEntry
+
+# Lignes gardées dans le panneau Historique (les plus anciennes sont retirées)
+HISTORY_MAX_BLOCKS = 1000
 
 
 class MainWindow(QMainWindow):
@@ -51,12 +56,17 @@ class MainWindow(QMainWindow):
             
             # État interne
             self.current_state_filter = None
+            self._history_snapshot = set()  # Entrées déjà affichées ou effacées, à ignorer dans history_appended
             print("  ✅ État interne initialisé")
             
             # Connecter les signaux
             print("  🔌 Connection des signaux...")
             self._connect_signals()
             print("  ✅ Signaux connectés")
+
+            # Historique : affiché une fois, puis complété entrée par entrée
+            self.ui.historyLog.document().setMaximumBlockCount(HISTORY_MAX_BLOCKS)
+            self.update_history_display()
             
             # Charger les données initiales
             print("  📂 Chargement des données...")
@@ -77,6 +87,7 @@ class MainWindow(QMainWindow):
         # === SIDEBAR ===
         self.ui.searchBar.textChanged.connect(self._on_search_changed)
         self.ui.stateFilter.currentTextChanged.connect(self._on_filter_changed)
+        self.ui.includeArchive.toggled.connect(self._on_search_changed)
         self.ui.taskList.itemClicked.connect(self._on_task_selected)
         self.ui.btnAdd.clicked.connect(self._on_add_task)
         self.ui.btnDelete.clicked.connect(self._on_delete_task)
@@ -100,6 +111,9 @@ class MainWindow(QMainWindow):
         # === SIGNAUX DU CONTRÔLEUR ===
         self.controller.tasks_updated.connect(self._refresh_task_list)
         self.controller.task_selected.connect(self._display_task_details)
+        self.controller.task_changed.connect(self._on_task_changed)
+        self.controller.tasks_unblocked.connect(self._on_tasks_unblocked)
+        self.controller.history_appended.connect(self._on_history_appended)
     
     # ========== RECHERCHE & FILTRE ==========
     
@@ -107,7 +121,9 @@ class MainWindow(QMainWindow):
     def _on_search_changed(self):
         """Déclenché quand le texte de recherche change"""
         query = self.ui.searchBar.text()
-        self.controller.search_and_filter(query, self.current_state_filter)
+        self.controller.search_and_filter(
+            query, self.current_state_filter, self.ui.includeArchive.isChecked()
+        )
     
     @Slot(str)
     def _on_filter_changed(self, state_text: str):
@@ -126,7 +142,9 @@ class MainWindow(QMainWindow):
         
         # Applique le filtre
         query = self.ui.searchBar.text()
-        self.controller.search_and_filter(query, self.current_state_filter)
+        self.controller.search_and_filter(
+            query, self.current_state_filter, self.ui.includeArchive.isChecked()
+        )
     
     # ========== AFFICHAGE LISTE ==========
     
@@ -138,25 +156,55 @@ class MainWindow(QMainWindow):
         tasks = self.controller.get_all_tasks()
         
         for task in tasks:
-            # Icône selon l'état
-            icon_map = {
-                TaskState.TODO: "📋",
-                TaskState.IN_PROGRESS: "⚙️",
-                TaskState.DONE: "✅",
-                TaskState.ABANDONED: "❌",
-                TaskState.WAITING: "⏳"
-            }
-            icon = icon_map.get(task.state, "📋")
-            
             # Crée l'item
-            item = QListWidgetItem(f"{icon} {task.title}")
+            item = QListWidgetItem(self._task_item_text(task))
             item.setData(Qt.UserRole, task.id)  # Stocke l'ID dans l'item
             
             self.ui.taskList.addItem(item)
+            
+            # Garde la tâche sélectionnée en surbrillance (la liste peut arriver en différé)
+            current = self.controller.current_task
+            if current and current.id == task.id:
+                self.ui.taskList.setCurrentItem(item)
         
         # Met à jour la barre de statut
         self.statusBar().showMessage(f"{len(tasks)} tâche(s)")
     
+    def _task_item_text(self, task: Task) -> str:
+        """Texte d'une ligne de la liste : icône selon l'état + titre"""
+        icon_map = {
+            TaskState.TODO: "📋",
+            TaskState.IN_PROGRESS: "⚙️",
+            TaskState.DONE: "✅",
+            TaskState.ABANDONED: "❌",
+            TaskState.WAITING: "⏳"
+        }
+        return f"{icon_map.get(task.state, '📋')} {task.title}"
+
+    @Slot(Task, object)
+    def _on_task_changed(self, task: Task, fields):
+        """Ne redessine que les widgets touchés par les champs modifiés"""
+        if fields & {"title", "state"}:
+            for row in range(self.ui.taskList.count()):
+                item = self.ui.taskList.item(row)
+                if item.data(Qt.UserRole) == task.id:
+                    item.setText(self._task_item_text(task))
+                    break
+
+        current = self.controller.current_task
+        if not current or current.id != task.id:
+            return
+        if fields <= {"comments", "updated_at"}:
+            self._refresh_comments(task)
+        else:
+            self._display_task_details(task)
+
+    @Slot(list)
+    def _on_tasks_unblocked(self, tasks: list):
+        """Annonce les tâches qui peuvent maintenant démarrer"""
+        titles = ", ".join(task.title for task in tasks)
+        self.statusBar().showMessage(f"🔓 Peut démarrer : {titles}", 5000)
+
     # ========== TÂCHES ==========
     
     @Slot(QListWidgetItem)
@@ -197,9 +245,9 @@ class MainWindow(QMainWindow):
             self.ui.waitingForSelect.clear()
             self.ui.waitingForSelect.addItem("(Aucune)", None)
             
-            all_tasks = self.controller.get_all_tasks()
-            for t in all_tasks:
-                if t.id != task.id and t.state != TaskState.DONE:
+            # Calculées avec la sélection, sur le thread du repository
+            for t in self.controller.waiting_candidates:
+                if t.id != task.id:
                     self.ui.waitingForSelect.addItem(t.title, t.id)
             
             # Sélectionne la tâche actuelle en attente
@@ -245,18 +293,16 @@ class MainWindow(QMainWindow):
         self.ui.btnStartWork.setVisible(is_todo)
         self.ui.btnStartTask.setVisible(is_waiting)
         if is_waiting:
-            # Vérifie si la tâche dont on dépend est terminée
-            can_start = True
-            if task.waiting_for:
-                waiting_task = self.controller.repository.find_by_id(task.waiting_for)
-                if waiting_task and waiting_task.state != TaskState.DONE:
-                    can_start = False
+            # Vérifie qu'aucune tâche de la chaîne de dépendances ne bloque encore
+            blockers = self.controller.current_blockers
+            can_start = not blockers
             
             self.ui.btnStartTask.setEnabled(can_start)
             
             # Tooltip explicatif
             if not can_start:
-                self.ui.btnStartTask.setToolTip("La tâche dont vous dépendez n'est pas encore terminée")
+                chain = " → ".join(blocker.title for blocker in blockers)
+                self.ui.btnStartTask.setToolTip(f"En attente de : {chain}")
             else:
                 self.ui.btnStartTask.setToolTip("Démarrer cette tâche")
         
@@ -347,19 +393,21 @@ class MainWindow(QMainWindow):
         waiting_group.setVisible(False)  # Caché par défaut
         layout.addWidget(waiting_group)
         
+        # Tâches pouvant être attendues, chargées (en arrière-plan) au passage en attente
+        candidates = []
+
+        def on_candidates_loaded(tasks):
+            candidates[:] = tasks
+            populate_waiting_tasks(waiting_search.text())
+
         # Fonction pour remplir la liste des tâches
         def populate_waiting_tasks(search_text=""):
             waiting_select.clear()
             waiting_select.addItem("(Sélectionnez une tâche)", None)
             
-            all_tasks = self.controller.get_all_tasks()
             search_lower = search_text.lower()
             
-            for task in all_tasks:
-                # Filtre : pas de tâches Abandonnées ou Clôturées
-                if task.state in [TaskState.ABANDONED, TaskState.DONE]:
-                    continue
-                
+            for task in candidates:
                 # Recherche par nom
                 if search_text and search_lower not in task.title.lower():
                     continue
@@ -432,7 +480,10 @@ class MainWindow(QMainWindow):
             waiting_group.setVisible(is_waiting)
             
             if is_waiting:
-                populate_waiting_tasks()
+                # Pas de tâches Abandonnées ou Clôturées (index par état du repository)
+                self.controller.get_tasks_by_state(
+                    on_candidates_loaded, TaskState.TODO, TaskState.IN_PROGRESS, TaskState.WAITING
+                )
             
             validate_form()  # ✨ Revalide après changement d'état
         
@@ -460,46 +511,9 @@ class MainWindow(QMainWindow):
             if state == TaskState.WAITING:
                 waiting_for = waiting_select.currentData()
             
-            # Créer la tâche (plus besoin de validation, le bouton était désactivé si invalide)
-            try:
-                task = Task(
-                    title=title,
-                    description=description,
-                    start_date=start_date,
-                    end_date=end_date,
-                    state=state,
-                    waiting_for=waiting_for
-                )
-                
-                self.controller.repository.save(task)
-                
-                # Log adapté
-                if waiting_for:
-                    waiting_task = self.controller.repository.find_by_id(waiting_for)
-                    waiting_title = waiting_task.title if waiting_task else "tâche inconnue"
-                    self.controller.logger.log(
-                        "info",
-                        f"Tâche créée : '{task.title}' (en attente de '{waiting_title}')"
-                    )
-                else:
-                    self.controller.logger.log("info", f"Tâche créée : '{task.title}'")
-                
-                self.controller.load_tasks()
-                
-                # Sélectionner automatiquement la tâche créée
-                self.controller.select_task(task.id)
-                
-                # Trouver l'item dans la liste et le sélectionner visuellement
-                for i in range(self.ui.taskList.count()):
-                    item = self.ui.taskList.item(i)
-                    if item.data(Qt.UserRole) == task.id:
-                        self.ui.taskList.setCurrentItem(item)
-                        break
-                
+            # Créer la tâche (enregistrée puis sélectionnée par le contrôleur)
+            if self.controller.create_task(title, description, start_date, end_date, state, waiting_for):
                 self.statusBar().showMessage("Tâche créée !", 3000)
-                
-            except ValueError as e:
-                QMessageBox.critical(self, "Erreur de validation", str(e))
           
     @Slot()
     def _on_save_task(self):
@@ -686,12 +700,9 @@ class MainWindow(QMainWindow):
         success = self.controller.add_comment_to_current_task(content)
         
         if success:
-            # Vide le champ
+            # Vide le champ (la liste des commentaires est rafraîchie via task_changed)
             self.ui.commentInput.clear()
             
-            # Rafraîchit les commentaires
-            self._refresh_comments(self.controller.current_task)
-            
             self.statusBar().showMessage("💬 Commentaire ajouté", 2000)
 
     @Slot()
@@ -746,8 +757,6 @@ class MainWindow(QMainWindow):
             success = self.controller.delete_comments_from_current_task(comments_to_delete)
             
             if success:
-                self._refresh_comments(self.controller.current_task)
-                
                 if count == 1:
                     self.statusBar().showMessage("Commentaire supprimé", 2000)
                 else:
@@ -776,14 +785,40 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
-            self.controller.logger.clear()
+            # Les entrées effacées encore en file (history_appended) ne doivent pas réapparaître
+            self._history_snapshot = set(self.controller.logger.clear())
             self.ui.historyLog.clear()
             self.statusBar().showMessage("🗑️ Historique effacé", 2000)
     
     def update_history_display(self):
-        """Met à jour l'affichage de l'historique"""
-        logs = self.controller.logger.get_all_logs()
-        self.ui.historyLog.setPlainText(logs)
+        """Affiche tout l'historique gardé en mémoire"""
+        entries = self.controller.logger.get_entries()
+        # Une entrée ajoutée pendant la copie arrivera aussi par history_appended
+        self._history_snapshot = set(entries)
+        self.ui.historyLog.setPlainText("\n".join(entry.format() for entry in entries))
+        self.ui.historyLog.moveCursor(QTextCursor.End)
+
+    @Slot(object)
+    def _on_history_appended(self, entry: LogEntry):
+        """Ajoute une ligne à la fin de l'historique, sans réafficher le reste"""
+        if self._history_snapshot:
+            if entry in self._history_snapshot:
+                return
+            self._history_snapshot = set()  # Les entrées suivantes sont toutes nouvelles
+
+        history = self.ui.historyLog
+        scrollbar = history.verticalScrollBar()
+        follow = scrollbar.value() == scrollbar.maximum()  # Ne déplace pas une lecture en cours
+
+        document = history.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        if not document.isEmpty():
+            cursor.insertBlock()
+        cursor.insertText(entry.format())
+
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
     
     # ========== UTILITAIRES ==========
     
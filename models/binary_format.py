@@ -0,0 +1,250 @@
+"""
+Format binaire compact pour le stockage des tâches.
+
+Plus petit et plus rapide à relire que le JSON indenté : pas de noms de clés
+répétés, dates en entiers (microsecondes depuis 1970) au lieu de chaînes ISO,
+état codé sur un octet.
+
+Structure du fichier :
+    MAGIC (8 octets)
+    puis pour chaque tâche : longueur (uint32) + enregistrement
+
+Enregistrement (little-endian) :
+    en-tête : état (uint8), version (uint32), start/end/created/updated (int64),
+              longueurs de l'id, du titre, de la description et de waiting_for (uint32),
+              nombre de commentaires (uint32)
+    puis les quatre chaînes UTF-8 à la suite
+    puis pour chaque commentaire : created (int64), longueurs id/contenu (uint32), id, contenu
+
+Les longueurs sont regroupées dans l'en-tête : un seul unpack par tâche.
+
+Conversion : python -m models.binary_format <fichier> json|binary
+"""
+import struct
+import sys
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from models.comment import Comment
+from models.task import Task, TaskState
+from models.timestamps import to_epoch_us
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+
+MAGIC = b"PYTASKS\x01"  # Préfixe + version du format
+
+# Codes d'état figés : ne pas dépendre de l'ordre de déclaration de TaskState
+STATE_CODES = {
+    TaskState.TODO: 0,
+    TaskState.IN_PROGRESS: 1,
+    TaskState.DONE: 2,
+    TaskState.ABANDONED: 3,
+    TaskState.WAITING: 4,
+}
+STATES_BY_CODE = {code: state for state, code in STATE_CODES.items()}
+
+NO_DATE = -2 ** 63   # Date absente
+NO_STRING = 0xFFFFFFFF  # Chaîne absente (None)
+
+_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<BIqqqqIIIII")
+_COMMENT_HEADER = struct.Struct("<qII")
+
+
+class BinaryFormatError(ValueError):
+    """Fichier binaire illisible (tronqué, version inconnue...)"""
+
+
+def detect_format(path: str) -> Optional[str]:
+    """
+    Détermine le format d'un fichier d'après son en-tête.
+
+    Returns:
+        FORMAT_BINARY, FORMAT_JSON, ou None si le fichier n'existe pas
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(len(MAGIC))
+    except FileNotFoundError:
+        return None
+    return FORMAT_BINARY if header[:-1] == MAGIC[:-1] else FORMAT_JSON
+
+
+# ========== ENCODAGE ==========
+
+def _encode_date(value: Optional[int]) -> int:
+    """Date déjà en microsecondes (cf. models.timestamps)"""
+    return NO_DATE if value is None else value
+
+
+def _iter_comment_fields(task: Task) -> Iterator[Tuple[int, str, str]]:
+    """(created_at en µs, id, contenu) de chaque commentaire, sans forcer leur désérialisation"""
+    if task._raw_comments is not None:
+        for comment_id, content, created_at in task._raw_comments:
+            yield to_epoch_us(datetime.fromisoformat(created_at)), comment_id, content
+    else:
+        for comment in task._comments or ():
+            yield comment._created_us, comment.id, comment.content
+
+
+def encode_task(task: Task) -> bytes:
+    """Sérialise une tâche (sans le préfixe de longueur)"""
+    task_id = task.id.encode('utf-8')
+    title = task.title.encode('utf-8')
+    description = task.description.encode('utf-8')
+    waiting_for = task.waiting_for.encode('utf-8') if task.waiting_for is not None else b""
+    comments = list(_iter_comment_fields(task))
+
+    parts = [
+        _HEADER.pack(
+            STATE_CODES[task.state],
+            task.version,
+            _encode_date(task._start_us),
+            _encode_date(task._end_us),
+            _encode_date(task._created_us),
+            _encode_date(task._updated_us),
+            len(task_id),
+            len(title),
+            len(description),
+            len(waiting_for) if task.waiting_for is not None else NO_STRING,
+            len(comments),
+        ),
+        task_id,
+        title,
+        description,
+        waiting_for,
+    ]
+
+    for created_at, comment_id, content in comments:
+        comment_id = comment_id.encode('utf-8')
+        content = content.encode('utf-8')
+        parts.append(_COMMENT_HEADER.pack(_encode_date(created_at), len(comment_id), len(content)))
+        parts.append(comment_id)
+        parts.append(content)
+
+    return b"".join(parts)
+
+
+def encode_file(tasks: List[Task]) -> Tuple[bytes, Dict[str, Tuple[int, int]]]:
+    """
+    Sérialise un fichier complet.
+
+    Returns:
+        (contenu, ID → (offset, longueur) de chaque enregistrement)
+    """
+    parts = [MAGIC]
+    offsets = {}
+    position = len(MAGIC)
+    for task in tasks:
+        record = encode_task(task)
+        parts.append(_LENGTH.pack(len(record)))
+        parts.append(record)
+        position += _LENGTH.size
+        offsets[task.id] = (position, len(record))
+        position += len(record)
+    return b"".join(parts), offsets
+
+
+# ========== DÉCODAGE ==========
+
+def _decode_date(value: int) -> Optional[int]:
+    return None if value == NO_DATE else value
+
+
+def decode_task(record: bytes) -> Task:
+    """Désérialise un enregistrement produit par encode_task"""
+    try:
+        (state, version, start, end, created, updated,
+         id_length, title_length, description_length, waiting_length, count) = _HEADER.unpack_from(record, 0)
+
+        position = _HEADER.size
+        task_id = record[position:position + id_length].decode('utf-8')
+        position += id_length
+        title = record[position:position + title_length].decode('utf-8')
+        position += title_length
+        description = record[position:position + description_length].decode('utf-8')
+        position += description_length
+        if waiting_length == NO_STRING:
+            waiting_for = None
+        else:
+            waiting_for = record[position:position + waiting_length].decode('utf-8')
+            position += waiting_length
+
+        # Dates stockées telles quelles, sans passer par datetime
+        task = Task._from_fields(
+            task_id,
+            title,
+            description,
+            STATES_BY_CODE[state],
+            waiting_for,
+            _decode_date(start),
+            _decode_date(end),
+            created,
+            updated,
+            version
+        )
+
+        comments = []
+        for _ in range(count):
+            comment_created, comment_id_length, content_length = _COMMENT_HEADER.unpack_from(record, position)
+            position += _COMMENT_HEADER.size
+            comment_id = record[position:position + comment_id_length].decode('utf-8')
+            position += comment_id_length
+            content = record[position:position + content_length].decode('utf-8')
+            position += content_length
+
+            comments.append(Comment._from_fields(comment_id, content, comment_created))
+        if comments:
+            task._comments = comments
+    except (struct.error, KeyError, UnicodeDecodeError) as e:
+        raise BinaryFormatError(f"Enregistrement invalide : {e}") from e
+
+    return task
+
+
+def iter_tasks(f: BinaryIO) -> Iterator[Task]:
+    """
+    Parcourt les tâches d'un fichier binaire, enregistrement par enregistrement.
+
+    Args:
+        f: Fichier ouvert en binaire, positionné au début (avant MAGIC)
+    """
+    magic = f.read(len(MAGIC))
+    if magic != MAGIC:
+        raise BinaryFormatError("En-tête absent ou version du format non prise en charge")
+
+    while True:
+        prefix = f.read(_LENGTH.size)
+        if not prefix:
+            return
+        if len(prefix) < _LENGTH.size:
+            raise BinaryFormatError("Fichier tronqué")
+
+        length, = _LENGTH.unpack(prefix)
+        record = f.read(length)
+        if len(record) < length:
+            raise BinaryFormatError("Fichier tronqué")
+        yield decode_task(record)
+
+
+# ========== CONVERSION ==========
+
+def main(argv: List[str]) -> int:
+    """Convertit un fichier de tâches sur place : <fichier> json|binary"""
+    if len(argv) != 2 or argv[1] not in (FORMAT_JSON, FORMAT_BINARY):
+        print("Usage : python -m models.binary_format <fichier> json|binary")
+        return 2
+
+    from models.task_repository import TaskRepository
+
+    path, file_format = argv
+    repository = TaskRepository(path)
+    count = len(repository.load_all())
+    repository.convert(file_format)
+    print(f"✅ {count} tâche(s) converties au format {file_format} : {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,14 +2,26 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
+from models.timestamps import from_epoch_us, iso_to_epoch_us, to_epoch_us
+
 class Comment:
+    __slots__ = ("id", "content", "_created_us")  # Date gardée en entier (cf. Task)
+
     def __init__(self, content: str, comment_id: Optional[str] = None):
         if not content or not content.strip():
             raise ValueError("Commentaire vide interdit")
         
         self.id = comment_id if comment_id else str(uuid.uuid4())
         self.content = content.strip()
-        self.created_at = datetime.now()
+        self._created_us = to_epoch_us(datetime.now())
+
+    @property
+    def created_at(self) -> datetime:
+        return from_epoch_us(self._created_us)
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_us = to_epoch_us(value)
     
     def to_dict(self) -> dict:
         return {
@@ -22,4 +34,18 @@ class Comment:
     def from_dict(cls, data: dict) -> 'Comment':
         comment = cls(data["content"], data["id"])
         comment.created_at = datetime.fromisoformat(data["created_at"])
-        return comment
\ No newline at end of file
+        return comment
+
+    @classmethod
+    def _from_fields(cls, comment_id: str, content: str, created_us: int) -> 'Comment':
+        """Construit un commentaire déjà validé, sans passer par __init__"""
+        comment = cls.__new__(cls)
+        comment.id = comment_id
+        comment.content = content
+        comment._created_us = created_us
+        return comment
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> 'Comment':
+        """Comme from_dict, sans validation : réservé aux données écrites par PyTasks"""
+        return cls._from_fields(data["id"], data["content"], iso_to_epoch_us(data["created_at"]))
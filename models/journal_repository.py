@@ -0,0 +1,273 @@
+"""
+Stockage des tâches par journal (append-only).
+
+Chaque modification est ajoutée en fin de journal sous forme d'une ligne
+JSON (la tâche entière, ou seulement les champs modifiés) ; le snapshot (tasks.json) est reconstruit en rejouant le journal,
+puis compacté en arrière-plan quand le journal dépasse un seuil.
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from models.task import Task, TaskChanges
+from models.task_repository import ConcurrentModificationError, TaskRepository
+
+
+def _save_record(task: Task, changes: Optional[TaskChanges]) -> dict:
+    """
+    Enregistrement d'une tâche écrite : seulement les champs modifiés si la
+    version précédente est déjà dans le snapshot ou le journal, sinon la tâche entière.
+    """
+    if changes is None or changes.is_new or task.version <= 1:
+        return {"op": "save", "task": task.to_dict()}
+
+    data = task.to_dict()
+    record = {
+        "op": "patch",
+        "id": task.id,
+        "version": task.version,
+        "fields": {field: data[field] for field in changes.fields if field != "comments"},
+    }
+    if changes.added_comments:
+        added = changes.added_comments
+        record["comments_added"] = [c for c in data["comments"] if c["id"] in added]
+    if changes.removed_comments:
+        record["comments_removed"] = list(changes.removed_comments)
+    return record
+
+
+def _apply_patch(data: dict, record: dict):
+    """Applique un enregistrement "patch" au dictionnaire d'une tâche (idempotent)"""
+    data.update(record["fields"])
+    data["version"] = record["version"]
+
+    removed = set(record.get("comments_removed", ()))
+    added = record.get("comments_added", ())
+    if removed or added:
+        comments = [c for c in data.get("comments", ()) if c["id"] not in removed]
+        known = {c["id"] for c in comments}
+        comments += [c for c in added if c["id"] not in known]
+        data["comments"] = comments
+
+
+class JournalTaskRepository(TaskRepository):
+    """Repository dont les écritures coûtent O(taille du changement)"""
+
+    def __init__(
+        self,
+        file_path: str = "tasks.json",
+        compact_threshold: int = 1024 * 1024,
+        background_compaction: bool = True,
+        flush_delay: Optional[float] = None,
+        file_format: Optional[str] = None,
+        snapshot_cache: bool = False
+    ):
+        """
+        Initialise le repository journalisé.
+
+        Args:
+            file_path: Chemin du snapshot (JSON ou binaire, cf. TaskRepository)
+            compact_threshold: Taille du journal (octets) déclenchant une compaction
+            background_compaction: Compacte dans un thread séparé (sinon en ligne)
+            flush_delay: Mode write-behind (cf. TaskRepository)
+            file_format: Format du snapshot (cf. TaskRepository)
+            snapshot_cache: Cache de démarrage (cf. TaskRepository), invalidé aussi par le journal
+        """
+        self.journal_path = file_path + ".journal"
+        self.compact_threshold = compact_threshold
+        self.background_compaction = background_compaction
+        self._compaction_thread: Optional[threading.Thread] = None
+        super().__init__(
+            file_path, flush_delay=flush_delay, file_format=file_format, snapshot_cache=snapshot_cache
+        )
+
+        # Les positions du snapshot ne tiennent pas compte du journal
+        self._offset_index = None
+
+    # ========== LECTURE ==========
+
+    def _file_signature(self) -> Optional[tuple]:
+        """Signature combinée du snapshot et du journal"""
+        signatures = []
+        for path in (self.file_path, self.journal_path):
+            try:
+                stat = os.stat(path)
+                signatures.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signatures.append(None)
+        return tuple(signatures)
+
+    def _read_file(self) -> List[Task]:
+        """Charge le snapshot puis rejoue le journal"""
+        # Le snapshot (JSON ou binaire) est écrit atomiquement : s'il est illisible, on le signale
+        tasks = {task.id: task for task in self._iter_snapshot()}
+
+        # Seule la dernière version de chaque tâche est désérialisée
+        saved = {}
+        for record in self._read_journal():
+            if record["op"] == "save":
+                saved[record["task"]["id"]] = record["task"]
+            elif record["op"] == "patch":
+                data = saved.get(record["id"])
+                if data is None:
+                    base = tasks.get(record["id"])
+                    if base is None:
+                        continue  # Tâche supprimée depuis
+                    data = saved[record["id"]] = base.to_dict()
+                _apply_patch(data, record)
+            elif record["op"] == "delete":
+                saved.pop(record["id"], None)
+                tasks.pop(record["id"], None)
+
+        for task in Task.from_trusted_dicts(saved.values()):
+            tasks[task.id] = task
+
+        return list(tasks.values())
+
+    def _snapshot_sources(self) -> List[str]:
+        return [self.file_path, self.journal_path]
+
+    def _iter_file(self) -> Iterator[Task]:
+        """Le journal doit être rejoué en entier avant de connaître l'état final"""
+        return iter(self._read_file())
+
+    def _read_journal(self) -> List[dict]:
+        """
+        Lit les enregistrements du journal. Une dernière ligne incomplète est
+        ignorée ; elle n'est retirée du fichier que sous verrou : sans lui, ce
+        peut être l'ajout en cours d'une autre instance.
+        """
+        if not os.path.exists(self.journal_path):
+            return []
+
+        records = []
+        with open(self.journal_path, 'rb') as f:
+            content = f.read()
+
+        offset = 0
+        for line in content.split(b'\n'):
+            if line.strip():
+                try:
+                    records.append(json.loads(line.decode('utf-8')))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Une écriture interrompue ne peut corrompre que la dernière ligne
+                    if offset + len(line) < len(content):
+                        raise
+                    if self._file_lock.is_held():
+                        # Aucun ajout en cours : reste d'une écriture interrompue
+                        print(f"⚠️ Enregistrement tronqué retiré de {self.journal_path}")
+                        with open(self.journal_path, 'r+b') as f:
+                            f.truncate(offset)
+                    break
+            offset += len(line) + 1
+        return records
+
+    # ========== ÉCRITURE ==========
+
+    def _write_changes(
+        self,
+        saved: List[Task],
+        deleted: List[str],
+        changes: Dict[str, Optional[TaskChanges]]
+    ):
+        """Ajoute les changements en fin de journal (appelé sous verrou)"""
+        lines = [
+            json.dumps(_save_record(task, changes.get(task.id)), ensure_ascii=False)
+            for task in saved
+        ]
+        lines += [json.dumps({"op": "delete", "id": task_id}) for task_id in deleted]
+
+        self._trim_torn_tail()
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _trim_torn_tail(self):
+        """
+        Retire la fin d'un ajout interrompu (appelé sous verrou), même si la
+        dernière lecture, faite sans verrou, l'a seulement ignorée : ajouter
+        à sa suite corromprait une ligne au milieu du journal.
+        """
+        try:
+            with open(self.journal_path, 'r+b') as f:
+                size = f.seek(0, os.SEEK_END)
+                if not size:
+                    return
+                f.seek(size - 1)
+                if f.read(1) == b'\n':
+                    return
+                f.seek(0)
+                end = f.read().rfind(b'\n') + 1
+                print(f"⚠️ Enregistrement tronqué retiré de {self.journal_path}")
+                f.truncate(end)
+        except FileNotFoundError:
+            pass
+
+    def _persist_changes(self, saved: List[Task], deleted: List[str], atomic: bool = False):
+        """Écrit les changements puis compacte si le journal dépasse le seuil"""
+        try:
+            super()._persist_changes(saved, deleted, atomic)
+        except ConcurrentModificationError:
+            # Les changements sans conflit ont pu être ajoutés au journal
+            self._compact_if_needed()
+            raise
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        """Lance la compaction si le journal dépasse le seuil (absent : rien à compacter)"""
+        try:
+            size = os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return
+        if size >= self.compact_threshold:
+            self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        """Lance la compaction (une seule à la fois)"""
+        if not self.background_compaction:
+            self.compact()
+            return
+
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def compact(self):
+        """
+        Réécrit le snapshot depuis l'état courant puis vide le journal.
+        Si le processus s'arrête entre les deux étapes, rejouer l'ancien
+        journal sur le nouveau snapshot donne le même résultat.
+        """
+        with self._lock:
+            self.flush()
+
+            with self._file_lock:
+                # Intègre ce qu'une autre instance a pu ajouter au journal
+                self._refresh()
+                tasks = self._tasks_to_write([])
+
+                # 1. Snapshot atomique
+                self._generation = None
+                generation = self._file_lock.next_generation()
+                self._write_file(tasks)
+
+                # 2. Journal vidé
+                with open(self.journal_path, 'w', encoding='utf-8'):
+                    pass
+
+                self._signature = self._file_signature()
+                self._generation = generation
+
+    def close(self):
+        """Termine une compaction en cours puis ferme (cf. TaskRepository.close)"""
+        self.wait_for_compaction()
+        super().close()
+
+    def wait_for_compaction(self):
+        """Attend la fin d'une compaction en cours (tests, fermeture)"""
+        if self._compaction_thread:
+            self._compaction_thread.join()
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Index annexe ID → (offset, longueur) des enregistrements d'un fichier de données.
+
+Permet de relire une seule tâche (via mmap) sans désérialiser tout le fichier.
+L'index mémorise la signature (mtime_ns, taille) du fichier de données : s'il a
+été modifié par un autre outil, l'index est ignoré jusqu'à la prochaine écriture.
+"""
+import json
+import mmap
+import os
+from typing import Dict, Optional, Tuple
+
+
+class OffsetIndex:
+    """Fichier d'index associé à un fichier de données"""
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self.index_path = data_path + ".idx"
+
+        # Dernier index lu, gardé en mémoire tant que le fichier ne change pas
+        self._entries: Dict[str, Tuple[int, int]] = {}
+        self._loaded_signature: Optional[tuple] = None
+
+    def _data_signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.data_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def write(self, entries: Dict[str, Tuple[int, int]]):
+        """
+        Enregistre l'index du fichier de données qui vient d'être écrit.
+
+        Args:
+            entries: ID → (offset, longueur) en octets
+        """
+        signature = self._data_signature()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"signature": signature, "entries": entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+        self._entries = dict(entries)
+        self._loaded_signature = signature
+
+    def _load(self) -> bool:
+        """Charge l'index s'il correspond au fichier de données actuel"""
+        signature = self._data_signature()
+        if signature is None:
+            return False
+        if signature == self._loaded_signature:
+            return True
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        if tuple(data.get("signature") or ()) != signature:
+            return False  # Index périmé
+
+        self._entries = {task_id: tuple(entry) for task_id, entry in data["entries"].items()}
+        self._loaded_signature = signature
+        return True
+
+    def read_record(self, task_id: str) -> Optional[bytes]:
+        """
+        Lit les octets d'un seul enregistrement.
+
+        Returns:
+            Les octets de l'enregistrement, b"" si l'ID est absent d'un index
+            valide, None si l'index est inutilisable (relecture complète nécessaire)
+        """
+        if not self._load():
+            return None
+
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return b""
+
+        offset, length = entry
+        with open(self.data_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data[offset:offset + length]
\ No newline at end of file
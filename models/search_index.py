@@ -0,0 +1,149 @@
+"""
+Index inversé plein texte sur le titre, la description et les commentaires.
+
+Recherche multi-termes (ET), par préfixe, insensible à la casse et aux
+accents, avec résultats classés par pertinence.
+"""
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Poids d'une occurrence selon le champ
+TITLE_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+COMMENT_WEIGHT = 1.0
+
+# Bonus quand le terme recherché est un mot entier (et pas seulement un préfixe)
+EXACT_MATCH_BONUS = 1.5
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe un texte en mots minuscules sans accents"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return TOKEN_PATTERN.findall(text)
+
+
+class SearchIndex:
+    """Index inversé : terme → {ID de tâche: poids}"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms_by_task: Dict[str, Set[str]] = {}
+        self._order: Dict[str, int] = {}  # Départage des égalités : ordre d'ajout
+        self._counter = 0
+
+        # Vocabulaire trié pour la recherche par préfixe, reconstruit à la demande
+        self._sorted_terms: List[str] = []
+        self._sorted_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._terms_by_task)
+
+    def add(self, task_id: str, title: str, description: str = "", comments: Iterable[str] = ()):
+        """Indexe (ou réindexe) une tâche"""
+        self.remove(task_id)
+
+        weights: Dict[str, float] = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0.0) + TITLE_WEIGHT
+        for token in tokenize(description):
+            weights[token] = weights.get(token, 0.0) + DESCRIPTION_WEIGHT
+        for comment in comments:
+            for token in tokenize(comment):
+                weights[token] = weights.get(token, 0.0) + COMMENT_WEIGHT
+
+        for token, weight in weights.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                self._sorted_dirty = True
+            posting[task_id] = weight
+
+        self._terms_by_task[task_id] = set(weights)
+        self._order[task_id] = self._counter
+        self._counter += 1
+
+    def remove(self, task_id: str):
+        """Retire une tâche de l'index"""
+        for token in self._terms_by_task.pop(task_id, ()):
+            posting = self._postings[token]
+            del posting[task_id]
+            if not posting:
+                del self._postings[token]
+                self._sorted_dirty = True
+        self._order.pop(task_id, None)
+
+    def _terms_with_prefix(self, prefix: str) -> List[str]:
+        """Termes du vocabulaire commençant par prefix (recherche dichotomique)"""
+        if self._sorted_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._sorted_dirty = False
+
+        terms = []
+        i = bisect_left(self._sorted_terms, prefix)
+        while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(prefix):
+            terms.append(self._sorted_terms[i])
+            i += 1
+        return terms
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Recherche les tâches contenant tous les termes (chacun en préfixe).
+
+        Returns:
+            Liste de (ID, score) triée par pertinence décroissante
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        total = len(self._terms_by_task) or 1
+
+        # Termes les plus sélectifs d'abord : les suivants ne notent que les candidats restants
+        expansions = []
+        for token in dict.fromkeys(tokens):
+            terms = self._terms_with_prefix(token)
+            size = sum(len(self._postings[term]) for term in terms)
+            if size == 0:
+                return []
+            expansions.append((size, token, terms))
+        expansions.sort(key=lambda item: item[0])
+
+        scores: Dict[str, float] = {}
+        for n, (size, token, terms) in enumerate(expansions):
+            token_scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self._postings[term]
+                factor = math.log(1 + total / len(posting))
+                if term == token:
+                    factor *= EXACT_MATCH_BONUS
+
+                if n == 0:
+                    for task_id, weight in posting.items():
+                        token_scores[task_id] = token_scores.get(task_id, 0.0) + weight * factor
+                elif len(scores) < len(posting):
+                    for task_id in scores:
+                        weight = posting.get(task_id)
+                        if weight is not None:
+                            token_scores[task_id] = token_scores.get(task_id, 0.0) + weight * factor
+                else:
+                    for task_id, weight in posting.items():
+                        if task_id in scores:
+                            token_scores[task_id] = token_scores.get(task_id, 0.0) + weight * factor
+
+            # ET : ne garde que les tâches trouvées pour tous les termes
+            if n == 0:
+                scores = token_scores
+            else:
+                scores = {task_id: scores[task_id] + score for task_id, score in token_scores.items()}
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], self._order[item[0]]))
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Cache de démarrage : instantané des champs des tâches déjà désérialisées.
+
+Au lancement suivant, si les fichiers sources n'ont pas changé, les tâches
+sont restaurées en un seul marshal.load au lieu d'être reparsées.
+La clé est la taille et l'empreinte (BLAKE2b) du contenu des sources :
+une modification par un autre outil invalide le cache, même si elle
+conserve la date de modification.
+
+Le cache est écrit à côté de tasks.json, qui peut être partagé : il ne
+contient que des valeurs simples (tuples, chaînes, entiers), jamais d'objets
+Python à reconstruire. Contrairement à pickle, le charger ne peut pas
+exécuter de code ; les tâches sont recréées champ par champ.
+"""
+import hashlib
+import marshal
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from models.comment import Comment
+from models.task import Task, TaskState
+from utils.gc_pause import paused_gc
+
+# À incrémenter quand la structure des enregistrements change : les anciens caches sont ignorés
+CACHE_VERSION = 5
+
+_STATE_BY_VALUE = {state.value: state for state in TaskState}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class SnapshotCache:
+    """Fichier cache (ex: tasks.json.cache) associé à un ou plusieurs fichiers sources"""
+
+    def __init__(self, cache_path: str, source_paths: Sequence[str]):
+        """
+        Args:
+            cache_path: Chemin du fichier cache
+            source_paths: Fichiers dont le contenu détermine les tâches (snapshot, journal...)
+        """
+        self.cache_path = cache_path
+        self.source_paths = list(source_paths)
+
+    def _sizes(self) -> List[Optional[int]]:
+        sizes = []
+        for path in self.source_paths:
+            try:
+                sizes.append(os.path.getsize(path))
+            except FileNotFoundError:
+                sizes.append(None)
+        return sizes
+
+    def _digest(self) -> str:
+        """Empreinte du contenu de toutes les sources"""
+        digest = hashlib.blake2b(digest_size=20)
+        for path in self.source_paths:
+            digest.update(b"\0")  # Séparateur entre sources
+            try:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+            except FileNotFoundError:
+                digest.update(b"\0absent")
+        return digest.hexdigest()
+
+    def _key(self) -> dict:
+        return {"version": CACHE_VERSION, "sizes": self._sizes(), "digest": self._digest()}
+
+    @staticmethod
+    def _to_record(task: Task) -> Tuple:
+        """Champs d'une tâche en valeurs simples ; les commentaires pas encore lus restent bruts (tuples)"""
+        comments = None
+        if task._raw_comments is None and task._comments:
+            comments = [(comment.id, comment.content, comment._created_us) for comment in task._comments]
+        return (
+            task.id, task._title, task._description, task._state.value, task._waiting_for,
+            task._start_us, task._end_us, task._created_us, task._updated_us, task.version,
+            task._raw_comments, comments,
+        )
+
+    @staticmethod
+    def _from_records(records: list) -> List[Task]:
+        """Recrée les tâches à partir des enregistrements de _to_record"""
+        from_fields = Task._from_fields
+        comment_from_fields = Comment._from_fields
+        states = _STATE_BY_VALUE
+        tasks = []
+        for (task_id, title, description, state, waiting_for, start_us, end_us,
+             created_us, updated_us, version, raw_comments, comments) in records:
+            task = from_fields(
+                task_id, title, description, states[state], waiting_for,
+                start_us, end_us, created_us, updated_us, version, raw_comments
+            )
+            if comments:
+                task._comments = [comment_from_fields(*fields) for fields in comments]
+            tasks.append(task)
+        return tasks
+
+    def load(self) -> Optional[List[Task]]:
+        """
+        Restaure les tâches si le cache correspond aux sources actuelles.
+
+        Returns:
+            Les tâches, ou None si le cache est absent, périmé ou illisible
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                key = marshal.load(f)
+                if not isinstance(key, dict) or key.get("version") != CACHE_VERSION:
+                    return None
+                # Taille d'abord : évite de hacher des sources manifestement modifiées
+                if key.get("sizes") != self._sizes() or key.get("digest") != self._digest():
+                    return None
+
+                with paused_gc():
+                    return self._from_records(marshal.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Cache corrompu ou écrit par une version incompatible : on le reconstruira
+            print(f"⚠️ Cache {self.cache_path} ignoré : {e}")
+            return None
+
+    def store(self, tasks: List[Task]):
+        """Enregistre l'instantané des tâches, qui doivent refléter les sources actuelles"""
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(self._key(), f)
+            marshal.dump([self._to_record(task) for task in tasks], f)
+        os.replace(tmp_path, self.cache_path)
+
+    def is_valid(self) -> bool:
+        """Indique si le cache correspond aux sources actuelles (sans charger les tâches)"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                key = marshal.load(f)
+        except Exception:
+            return False
+        return key == self._key()
@@ -0,0 +1,618 @@
+"""
+Repository SQLite (module standard sqlite3).
+
+Même contrat que TaskRepository (CRUD, transactions, versions, recherche
+plein texte, dépendances, statistiques), avec tâches et commentaires dans
+des tables normalisées et des index sur les colonnes filtrées.
+Les écritures sont immédiates : pas d'écriture différée ni d'archive.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from models.search_index import tokenize
+from models.task import Task, TaskChanges, TaskState
+from models.task_index import TaskIndex
+from models.task_repository import CLOSED_STATES, ConcurrentModificationError, TaskRepository
+from models.timestamps import iso_to_epoch_us
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          TEXT PRIMARY KEY,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    start_date  TEXT,
+    end_date    TEXT,
+    state       TEXT NOT NULL,
+    waiting_for TEXT,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    version     INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id         TEXT PRIMARY KEY,
+    task_id    TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    content    TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_state       ON tasks(state);
+CREATE INDEX IF NOT EXISTS idx_tasks_waiting_for ON tasks(waiting_for);
+CREATE INDEX IF NOT EXISTS idx_tasks_start_date  ON tasks(start_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_end_date    ON tasks(end_date);
+CREATE INDEX IF NOT EXISTS idx_comments_task     ON comments(task_id);
+"""
+
+# Index plein texte (même découpage que SearchIndex : minuscules, sans accents)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    task_id UNINDEXED, title, description, comments,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Poids des colonnes de tasks_fts pour bm25 (cf. TITLE_WEIGHT de SearchIndex)
+FTS_WEIGHTS = "0.0, 3.0, 1.0, 1.0"
+
+BATCH_SIZE = 500
+
+TASK_COLUMNS = "id, title, description, start_date, end_date, state, waiting_for, created_at, updated_at, version"
+TASK_COLUMN_NAMES = TASK_COLUMNS.split(", ")
+
+
+class SqliteTaskRepository:
+    """Repository stockant les tâches dans une base SQLite"""
+
+    def __init__(self, db_path: str = "tasks.db"):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+
+        # Version de chaque tâche lue ou écrite par cette instance : garde des suppressions
+        self._base_versions: Dict[str, int] = {}
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        # lower() de SQLite ne gère que l'ASCII : on utilise celui de Python
+        self._conn.create_function("py_lower", 1, lambda s: s.lower() if s else s, deterministic=True)
+        self._conn.executescript(SCHEMA)
+        self._migrate_schema()
+
+        # Tâches écrites dans la transaction en cours, avec leurs changements (annulation)
+        self._transaction: Optional[List[Tuple[Task, Optional[TaskChanges]]]] = None
+
+        # Index état/dépendances, reconstruit après une écriture (cf. _get_task_index)
+        self._task_index: Optional[TaskIndex] = None
+        self._task_index_version: Optional[int] = None
+
+        # Sans écriture différée, jamais appelé (même attribut que TaskRepository)
+        self.on_flush_error: Optional[Callable[[Exception], None]] = None
+
+    def _migrate_schema(self):
+        """Met à niveau une base créée par une version précédente"""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        with self._conn:
+            if "version" not in columns:
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            print("⚠️ SQLite sans FTS5 : recherche limitée aux titres")
+            self._fts = False
+            return
+
+        # Index plein texte absent ou incomplet (base antérieure) : reconstruit
+        tasks_count = self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        fts_count = self._conn.execute("SELECT COUNT(*) FROM tasks_fts").fetchone()[0]
+        if tasks_count != fts_count:
+            with self._conn:
+                self._conn.execute("DELETE FROM tasks_fts")
+                for task in self.load_all():
+                    self._index_text(task)
+
+    def flush(self):
+        """Sans écriture différée : rien à faire (même contrat que TaskRepository)"""
+
+    def invalidate(self):
+        """Force la reconstruction de l'index des dépendances"""
+        self._task_index = None
+
+    def close(self):
+        """Ferme la connexion"""
+        self._conn.close()
+
+    # ========== CONVERSION ==========
+
+    def _rows_to_tasks(self, rows: List[sqlite3.Row]) -> List[Task]:
+        """Construit les Task (et leurs commentaires) depuis des lignes de la table tasks"""
+        if not rows:
+            return []
+
+        comments: Dict[str, List[dict]] = {row["id"]: [] for row in rows}
+        task_ids = list(comments)
+
+        # Par paquets pour rester sous la limite de paramètres de SQLite
+        for start in range(0, len(task_ids), BATCH_SIZE):
+            batch = task_ids[start:start + BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            for row in self._conn.execute(
+                f"SELECT id, task_id, content, created_at FROM comments "
+                f"WHERE task_id IN ({placeholders}) ORDER BY rowid",
+                batch
+            ):
+                comments[row["task_id"]].append(
+                    {"id": row["id"], "content": row["content"], "created_at": row["created_at"]}
+                )
+
+        records = []
+        for row in rows:
+            self._base_versions[row["id"]] = row["version"]
+            data = dict(row)
+            data["comments"] = comments[row["id"]]
+            records.append(data)
+        return Task.from_trusted_dicts(records)
+
+    def _write_task(self, task: Task, changes: Optional[TaskChanges]) -> bool:
+        """
+        Écrit une tâche dont la version vient d'être incrémentée, en une seule
+        requête gardée par la version attendue en base (task.version - 1) :
+        aucune autre connexion ne peut écrire entre la vérification et l'écriture.
+        Une tâche déjà écrite ne met à jour que les colonnes et commentaires
+        modifiés ; une tâche nouvelle (ou d'une base antérieure aux versions,
+        version 0) est insérée, ou remplace une ligne restée en version 0.
+
+        Returns:
+            False si la version en base n'est plus celle attendue, ou si la tâche
+            déjà écrite a été supprimée (conflit : rien n'est écrit)
+        """
+        expected = task.version - 1
+        data = task.to_dict()
+
+        if not expected:
+            cursor = self._conn.execute(
+                f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                "title = excluded.title, description = excluded.description, "
+                "start_date = excluded.start_date, end_date = excluded.end_date, "
+                "state = excluded.state, waiting_for = excluded.waiting_for, "
+                "created_at = excluded.created_at, updated_at = excluded.updated_at, "
+                "version = excluded.version "
+                "WHERE tasks.version = 0",
+                [data[column] for column in TASK_COLUMN_NAMES]
+            )
+            partial = False
+        else:
+            # Sans changements connus, toutes les colonnes sont réécrites
+            partial = bool(changes) and not changes.is_new
+            columns = (
+                sorted(changes.fields - {"comments"}) + ["version"] if partial
+                else [column for column in TASK_COLUMN_NAMES if column != "id"]
+            )
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            cursor = self._conn.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ? AND version = ?",
+                [data[column] for column in columns] + [task.id, expected]
+            )
+        if cursor.rowcount == 0:
+            return False
+
+        if not partial:
+            self._replace_comments(task, data)
+            return True
+
+        if changes.removed_comments:
+            self._conn.executemany(
+                "DELETE FROM comments WHERE id = ? AND task_id = ?",
+                [(comment_id, task.id) for comment_id in changes.removed_comments]
+            )
+        if changes.added_comments:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO comments (id, task_id, content, created_at) VALUES (?, ?, ?, ?)",
+                [
+                    (c["id"], task.id, c["content"], c["created_at"])
+                    for c in data["comments"] if c["id"] in changes.added_comments
+                ]
+            )
+        if changes.changed_fields() & {"title", "description", "comments"}:
+            self._index_text(task)
+        return True
+
+    def _replace_comments(self, task: Task, data: dict):
+        """Remplace les commentaires d'une tâche écrite entièrement et réindexe ses textes"""
+        self._conn.execute("DELETE FROM comments WHERE task_id = ?", (task.id,))
+        self._conn.executemany(
+            "INSERT INTO comments (id, task_id, content, created_at) VALUES (?, ?, ?, ?)",
+            [(c["id"], task.id, c["content"], c["created_at"]) for c in data["comments"]]
+        )
+        self._index_text(task)
+
+    def _index_text(self, task: Task):
+        """Réindexe les textes d'une tâche dans tasks_fts"""
+        if not self._fts:
+            return
+        self._conn.execute("DELETE FROM tasks_fts WHERE task_id = ?", (task.id,))
+        self._conn.execute(
+            "INSERT INTO tasks_fts (task_id, title, description, comments) VALUES (?, ?, ?, ?)",
+            (task.id, task.title, task.description, "\n".join(task.comment_contents()))
+        )
+
+    # ========== ÉCRITURE ==========
+
+    def _write(
+        self,
+        saved: List[Task],
+        deleted: List[str],
+        written: List[Tuple[Task, Optional[TaskChanges]]]
+    ) -> List[str]:
+        """
+        Écrit les changements dans la transaction SQL ouverte (appelé sous verrou).
+        Une tâche est en conflit si sa version en base n'est plus celle à partir
+        de laquelle elle a été modifiée, ou lue avant sa suppression (même règle
+        que TaskRepository) ; chaque écriture vérifie la version elle-même.
+
+        Args:
+            written: Reçoit (tâche, changements retirés) de chaque tâche écrite
+
+        Returns:
+            IDs des tâches en conflit (non écrites)
+        """
+        conflicts = []
+        for task in saved:
+            changes = task._take_changes()
+            task.version += 1
+            if not self._write_task(task, changes):
+                task.version -= 1
+                task._restore_changes(changes)
+                conflicts.append(task.id)
+                continue
+            written.append((task, changes))
+            self._base_versions[task.id] = task.version
+
+        for task_id in deleted:
+            expected = self._base_versions.get(task_id)
+            if expected is None:
+                # Jamais lue par cette instance : aucune version à protéger
+                self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            elif self._conn.execute(
+                "DELETE FROM tasks WHERE id = ? AND version = ?", (task_id, expected)
+            ).rowcount == 0:
+                if self._conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone():
+                    conflicts.append(task_id)  # Modifiée depuis notre lecture
+                    continue
+            if self._fts:
+                self._conn.execute("DELETE FROM tasks_fts WHERE task_id = ?", (task_id,))
+
+        self._task_index = None
+        return conflicts
+
+    def _restore(self, written: List[Tuple[Task, Optional[TaskChanges]]]):
+        """Remet version et changements des tâches dont l'écriture a été annulée"""
+        for task, changes in reversed(written):
+            task.version -= 1
+            task._restore_changes(changes)
+            self._base_versions[task.id] = task.version
+
+    def _apply(self, saved: List[Task], deleted: List[str]):
+        """
+        Écrit immédiatement, ou dans la transaction en cours.
+
+        Raises:
+            ConcurrentModificationError: hors transaction, après avoir écrit les
+                changements sans conflit ; dans une transaction, toute la
+                transaction est annulée
+        """
+        with self._lock:
+            if self._transaction is not None:
+                conflicts = self._write(saved, deleted, self._transaction)
+            else:
+                written = []
+                try:
+                    with self._conn:
+                        conflicts = self._write(saved, deleted, written)
+                except BaseException:
+                    self._restore(written)
+                    raise
+
+        if conflicts:
+            raise ConcurrentModificationError(conflicts)
+
+    @contextmanager
+    def transaction(self) -> Iterator['SqliteTaskRepository']:
+        """
+        Regroupe les save/delete du bloc dans une seule transaction SQL.
+        Tout ou rien : si le bloc lève une exception (y compris un conflit
+        de version), rien n'est écrit (cf. TaskRepository.transaction).
+        """
+        with self._lock:
+            # Transaction imbriquée : rattachée à la transaction englobante
+            if self._transaction is not None:
+                yield self
+                return
+
+            self._conn.execute("BEGIN")
+            self._transaction = []
+            try:
+                yield self
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                self._restore(self._transaction)
+                self._task_index = None
+                raise
+            finally:
+                self._transaction = None
+
+    # ========== CRUD ==========
+
+    def load_all(self) -> List[Task]:
+        """Charge toutes les tâches (ordre d'insertion)"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY rowid").fetchall()
+            return self._rows_to_tasks(rows)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Parcourt les tâches par paquets (ordre d'insertion)"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {TASK_COLUMNS} FROM tasks ORDER BY rowid").fetchall()
+        for start in range(0, len(rows), BATCH_SIZE):
+            with self._lock:
+                tasks = self._rows_to_tasks(rows[start:start + BATCH_SIZE])
+            yield from tasks
+
+    def save(self, task: Task):
+        """Sauvegarde/Update une tâche"""
+        self._apply([task], [])
+
+    def modify(self, task: Task, change: Callable[[Task], None]) -> FrozenSet[str]:
+        """Modifie puis sauvegarde une tâche sous verrou (cf. TaskRepository.modify)"""
+        with self._lock:
+            change(task)
+            fields = task.changes().changed_fields()
+            self.save(task)
+            return fields
+
+    def delete(self, task_id: str) -> bool:
+        """Supprime une tâche (et ses commentaires) par son ID"""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is None:
+                return False
+            self._apply([], [task_id])
+            return True
+
+    def save_many(self, tasks: Iterable[Task]):
+        """Sauvegarde plusieurs tâches en une seule transaction"""
+        tasks = list(tasks)
+        if tasks:
+            self._apply(tasks, [])
+
+    def delete_many(self, task_ids: Iterable[str]) -> int:
+        """
+        Supprime plusieurs tâches en une seule transaction.
+
+        Returns:
+            Nombre de tâches effectivement supprimées
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        with self._lock:
+            existing = {
+                row["id"]
+                for start in range(0, len(task_ids), BATCH_SIZE)
+                for row in self._conn.execute(
+                    f"SELECT id FROM tasks WHERE id IN ({','.join('?' * len(task_ids[start:start + BATCH_SIZE]))})",
+                    task_ids[start:start + BATCH_SIZE]
+                )
+            }
+            deleted = [task_id for task_id in task_ids if task_id in existing]
+            if deleted:
+                self._apply([], deleted)
+            return len(deleted)
+
+    def search(
+        self,
+        query: str,
+        state_filter: Optional[TaskState] = None,
+        limit: Optional[int] = None,
+        include_archive: bool = False
+    ) -> List[Task]:
+        """
+        Recherche + filtre par état (index idx_tasks_state).
+        Avec un texte, interroge l'index plein texte (titre, description,
+        commentaires ; tous les mots, en préfixe) et classe par pertinence.
+        include_archive est sans effet : les index SQLite rendent une archive inutile.
+        """
+        conditions = []
+        params = []
+        join = ""
+        order = "tasks.rowid"
+
+        tokens = tokenize(query) if query else []
+        if tokens and self._fts:
+            join = "JOIN tasks_fts ON tasks_fts.task_id = tasks.id"
+            conditions.append("tasks_fts MATCH ?")
+            params.append(" AND ".join(f'"{token}"*' for token in dict.fromkeys(tokens)))
+            order = f"bm25(tasks_fts, {FTS_WEIGHTS}), tasks.rowid"
+        elif query and query.strip():
+            conditions.append("instr(py_lower(title), ?) > 0")
+            params.append(query.lower())
+
+        if state_filter:
+            conditions.append("state = ?")
+            params.append(state_filter.value)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ", ".join(f"tasks.{column}" for column in TASK_COLUMNS.split(", "))
+        sql = f"SELECT {columns} FROM tasks {join} {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return self._rows_to_tasks(self._conn.execute(sql, params).fetchall())
+
+    def find_by_id(self, task_id: str) -> Optional[Task]:
+        """
+        Trouve une tâche par son ID.
+
+        Args:
+            task_id: L'ID de la tâche à rechercher
+
+        Returns:
+            La tâche trouvée ou None si elle n'existe pas
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            tasks = self._rows_to_tasks([row] if row else [])
+            return tasks[0] if tasks else None
+
+    def _find_by_ids(self, task_ids: List[str]) -> List[Task]:
+        """Tâches dans l'ordre des IDs donnés"""
+        rows = {}
+        for start in range(0, len(task_ids), BATCH_SIZE):
+            batch = task_ids[start:start + BATCH_SIZE]
+            for row in self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id IN ({','.join('?' * len(batch))})", batch
+            ):
+                rows[row["id"]] = row
+        return self._rows_to_tasks([rows[task_id] for task_id in task_ids if task_id in rows])
+
+    def find_by_state(self, *states: TaskState) -> List[Task]:
+        """Tâches dans l'un des états donnés (index idx_tasks_state)"""
+        with self._lock:
+            rows = [
+                row
+                for state in states
+                for row in self._conn.execute(
+                    f"SELECT {TASK_COLUMNS} FROM tasks WHERE state = ? ORDER BY rowid", (state.value,)
+                )
+            ]
+            return self._rows_to_tasks(rows)
+
+    def find_waiting_on(self, task_id: str) -> List[Task]:
+        """Tâches dont waiting_for désigne task_id (index idx_tasks_waiting_for)"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE waiting_for = ? ORDER BY rowid", (task_id,)
+            ).fetchall()
+            return self._rows_to_tasks(rows)
+
+    # ========== DÉPENDANCES ==========
+
+    def _get_task_index(self) -> TaskIndex:
+        """
+        Graphe des dépendances, construit sur les seules colonnes id/state/waiting_for.
+        Reconstruit après nos écritures, ou celles d'une autre connexion (PRAGMA data_version).
+        """
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._task_index is None or data_version != self._task_index_version:
+            index = TaskIndex()
+            for row in self._conn.execute("SELECT id, state, waiting_for FROM tasks ORDER BY rowid"):
+                index.add_entry(row["id"], TaskState.from_string(row["state"]), row["waiting_for"])
+            self._task_index = index
+            self._task_index_version = data_version
+        return self._task_index
+
+    def find_blockers(self, task_id: str) -> List[Task]:
+        """Tâches non réalisées dont task_id dépend (cf. TaskRepository.find_blockers)"""
+        with self._lock:
+            return self._find_by_ids(self._get_task_index().blockers_of(task_id))
+
+    def would_create_cycle(self, task_id: str, waiting_for_id: str) -> bool:
+        """Indique si la dépendance fermerait une boucle (cf. TaskRepository.would_create_cycle)"""
+        with self._lock:
+            return self._get_task_index().would_create_cycle(task_id, waiting_for_id)
+
+    def find_startable(self, include_blocked: bool = False) -> List[Task]:
+        """Tâches démarrables, dans l'ordre des dépendances (cf. TaskRepository.find_startable)"""
+        with self._lock:
+            index = self._get_task_index()
+            order = index.dependency_order((TaskState.TODO, TaskState.WAITING))
+            if not include_blocked:
+                order = [task_id for task_id in order if not index.blockers_of(task_id)]
+            return self._find_by_ids(order)
+
+    # ========== STATISTIQUES ==========
+
+    def count_by_state(self, include_archive: bool = False) -> Dict[TaskState, int]:
+        """Nombre de tâches par état (include_archive sans effet, cf. search)"""
+        counts = {state: 0 for state in TaskState}
+        with self._lock:
+            for row in self._conn.execute("SELECT state, COUNT(*) AS n FROM tasks GROUP BY state"):
+                counts[TaskState.from_string(row["state"])] = row["n"]
+        return counts
+
+    def find_overdue(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        Tâches dont la date de fin est passée sans qu'elles soient clôturées
+        (dates ISO : l'ordre des chaînes est celui des dates, index idx_tasks_end_date).
+        """
+        now = now or datetime.now()
+        closed = [state.value for state in CLOSED_STATES]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                f"WHERE end_date IS NOT NULL AND end_date < ? AND state NOT IN ({','.join('?' * len(closed))}) "
+                "ORDER BY rowid",
+                [now.isoformat()] + closed
+            ).fetchall()
+            return self._rows_to_tasks(rows)
+
+    def average_cycle_time(self, include_archive: bool = False) -> Optional[timedelta]:
+        """Durée moyenne début → fin des tâches réalisées (include_archive sans effet)"""
+        total = 0
+        count = 0
+        with self._lock:
+            for row in self._conn.execute(
+                "SELECT start_date, end_date FROM tasks "
+                "WHERE state = ? AND start_date IS NOT NULL AND end_date IS NOT NULL",
+                (TaskState.DONE.value,)
+            ):
+                total += iso_to_epoch_us(row["end_date"]) - iso_to_epoch_us(row["start_date"])
+                count += 1
+
+        if not count:
+            return None
+        return timedelta(microseconds=total / count)
+
+    def archive_closed_tasks(self, max_age_days: float) -> int:
+        """Sans archive (cf. search) : rien à déplacer"""
+        return 0
+
+    # ========== MIGRATION ==========
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Importe un tasks.json existant (une seule fois : ne fait rien si la base contient déjà des tâches).
+
+        Args:
+            json_path: Chemin du fichier JSON à importer
+
+        Returns:
+            Nombre de tâches importées
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone():
+                return 0
+
+            tasks = TaskRepository(json_path).load_all()
+            # Base vide : insertion directe, versions reprises telles quelles
+            with self._conn:
+                for task in tasks:
+                    data = task.to_dict()
+                    self._conn.execute(
+                        f"INSERT INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [data[column] for column in TASK_COLUMN_NAMES]
+                    )
+                    self._replace_comments(task, data)
+            self._task_index = None
+            return len(tasks)
\ No newline at end of file
@@ -1,7 +1,9 @@
 from enum import Enum
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, FrozenSet, Iterable, Optional, List, Set, Tuple
 from models.comment import Comment
+from models.timestamps import EPOCH, from_epoch_us, iso_to_epoch_us, to_epoch_us
+from utils.gc_pause import paused_gc
 import uuid
 
 class TaskState(Enum):
@@ -15,12 +17,85 @@ class TaskState(Enum):
     @classmethod
     def from_string(cls, state_str: str):
         """Convertit une chaîne en TaskState"""
-        for state in cls:
-            if state.value == state_str:
-                return state
-        raise ValueError(f"État invalide: {state_str}")
+        state = _STATE_BY_VALUE.get(state_str)
+        if state is None:
+            raise ValueError(f"État invalide: {state_str}")
+        return state
+
+# Recherche O(1) d'un état par sa valeur
+_STATE_BY_VALUE = {state.value: state for state in TaskState}
+
+# Commentaire pas encore désérialisé : (id, contenu, date de création ISO)
+RawComment = Tuple[str, str, str]
+
+
+def _compact_comments(records: Optional[List[dict]]) -> Optional[Tuple[RawComment, ...]]:
+    """
+    Commentaires lus en JSON → tuples, gardés tels quels jusqu'au premier accès.
+    Un tuple de 3 chaînes occupe le tiers d'un dict à 3 clés, sans coût de
+    décodage des dates.
+    """
+    if not records:
+        return None
+    return tuple((c["id"], c["content"], c["created_at"]) for c in records)
+
+
+# Champs dont les modifications sont suivies (noms des attributs publics)
+TRACKED_FIELDS = frozenset({
+    "title", "description", "start_date", "end_date",
+    "state", "waiting_for", "comments", "updated_at",
+})
+
+
+class TaskChanges:
+    """Champs et commentaires modifiés depuis la dernière écriture d'une tâche"""
+
+    __slots__ = ("is_new", "fields", "added_comments", "removed_comments")
+
+    def __init__(self, is_new: bool = False):
+        self.is_new = is_new  # Jamais écrite : tout est à écrire
+        self.fields: Set[str] = set()
+        self.added_comments: Dict[str, None] = {}  # IDs, dans l'ordre d'ajout
+        self.removed_comments: Set[str] = set()
+
+    def __bool__(self) -> bool:
+        return self.is_new or bool(self.fields)
+
+    def changed_fields(self) -> FrozenSet[str]:
+        """Champs à réécrire (tous pour une tâche nouvelle)"""
+        return TRACKED_FIELDS if self.is_new else frozenset(self.fields)
+
+    def add_comment_changes(self, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        """Note des commentaires ajoutés ou retirés"""
+        self.fields.add("comments")
+        for comment_id in added:
+            self.removed_comments.discard(comment_id)
+            self.added_comments[comment_id] = None
+        for comment_id in removed:
+            if comment_id in self.added_comments:
+                # Ajouté puis retiré avant écriture : rien à écrire pour lui
+                del self.added_comments[comment_id]
+            else:
+                self.removed_comments.add(comment_id)
+
+    def merge(self, newer: 'TaskChanges'):
+        """Ajoute des changements survenus après ceux-ci"""
+        self.is_new = self.is_new or newer.is_new
+        self.fields |= newer.fields
+        if newer.added_comments or newer.removed_comments:
+            self.add_comment_changes(newer.added_comments, newer.removed_comments)
+
 
 class Task:
+    # Pas de __dict__ par instance (les tâches peuvent se compter par centaines
+    # de milliers). Les dates sont gardées en entiers (microsecondes depuis 1970)
+    # et converties en datetime à la lecture.
+    __slots__ = (
+        "id", "_title", "_description", "_state", "_waiting_for",
+        "_start_us", "_end_us", "_created_us", "_updated_us",
+        "_comments", "_raw_comments", "version", "_changes",
+    )
+
     def __init__(
         self,
         title: str,
@@ -50,28 +125,204 @@ class Task:
         # 2. Génération ou assignation de l'UUID
         self.id = task_id if task_id else str(uuid.uuid4())
         
-        # 3. Assignation des attributs
-        self.title = title.strip()
-        self.description = description.strip() if description else ""
-        self.start_date = start_date  # Peut être None
-        self.end_date = end_date      # Peut être None
-        self.state = state
-        self.waiting_for = waiting_for
-        self.comments = []  # Liste vide au départ
+        # 3. Assignation des attributs (tâche jamais écrite : tout est à écrire)
+        self._changes: Optional[TaskChanges] = TaskChanges(is_new=True)
+        self._title = title.strip()
+        self._description = description.strip() if description else ""
+        self._start_us = to_epoch_us(start_date)  # Peut être None
+        self._end_us = to_epoch_us(end_date)      # Peut être None
+        self._state = state
+        self._waiting_for = waiting_for
+        self._comments: Optional[List[Comment]] = None  # Liste créée au premier ajout
+        self._raw_comments: Optional[Tuple[RawComment, ...]] = None  # Commentaires pas encore désérialisés
         
         # 4. Timestamps
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._created_us = self._updated_us = to_epoch_us(datetime.now())
+        self.version = 0  # Incrémenté à chaque écriture (détection des modifications concurrentes)
         
         # 5. Validation métier
         self._validate_dates()
-      
+
+    # ========== SUIVI DES MODIFICATIONS ==========
+
+    def _mark_changed(self, field: str):
+        if self._changes is None:
+            self._changes = TaskChanges()
+        self._changes.fields.add(field)
+
+    def changes(self) -> TaskChanges:
+        """
+        Modifications en attente d'écriture.
+
+        Returns:
+            Les changements depuis la dernière écriture (vide si aucun)
+        """
+        return self._changes if self._changes is not None else TaskChanges()
+
+    def _take_changes(self) -> Optional[TaskChanges]:
+        """Retire et renvoie les modifications en attente (avant une écriture)"""
+        changes, self._changes = self._changes, None
+        return changes
+
+    def _restore_changes(self, changes: Optional[TaskChanges]):
+        """Remet des modifications retirées par _take_changes (écriture échouée)"""
+        if changes is None:
+            return
+        if self._changes is not None:
+            changes.merge(self._changes)
+        self._changes = changes
+
+    # ========== ATTRIBUTS SUIVIS ==========
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str):
+        if value != self._title:
+            self._title = value
+            self._mark_changed("title")
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @description.setter
+    def description(self, value: str):
+        if value != self._description:
+            self._description = value
+            self._mark_changed("description")
+
+    @property
+    def state(self) -> TaskState:
+        return self._state
+
+    @state.setter
+    def state(self, value: TaskState):
+        if value is not self._state:
+            self._state = value
+            self._mark_changed("state")
+
+    @property
+    def waiting_for(self) -> Optional[str]:
+        return self._waiting_for
+
+    @waiting_for.setter
+    def waiting_for(self, value: Optional[str]):
+        if value != self._waiting_for:
+            self._waiting_for = value
+            self._mark_changed("waiting_for")
+
+    # ========== ATTRIBUTS STOCKÉS SOUS FORME COMPACTE ==========
+
+    @property
+    def start_date(self) -> Optional[datetime]:
+        return from_epoch_us(self._start_us)
+
+    @start_date.setter
+    def start_date(self, value: Optional[datetime]):
+        value = to_epoch_us(value)
+        if value != self._start_us:
+            self._start_us = value
+            self._mark_changed("start_date")
+
+    @property
+    def end_date(self) -> Optional[datetime]:
+        return from_epoch_us(self._end_us)
+
+    @end_date.setter
+    def end_date(self, value: Optional[datetime]):
+        value = to_epoch_us(value)
+        if value != self._end_us:
+            self._end_us = value
+            self._mark_changed("end_date")
+
+    @property
+    def created_at(self) -> datetime:
+        return from_epoch_us(self._created_us)
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_us = to_epoch_us(value)
+
+    @property
+    def updated_at(self) -> datetime:
+        return from_epoch_us(self._updated_us)
+
+    @updated_at.setter
+    def updated_at(self, value: datetime):
+        value = to_epoch_us(value)
+        if value != self._updated_us:
+            self._updated_us = value
+            self._mark_changed("updated_at")
+
+    def _comment_ids(self) -> List[str]:
+        if self._raw_comments is not None:
+            return [c[0] for c in self._raw_comments]
+        return [c.id for c in self._comments or ()]
+
+    @property
+    def comments(self) -> List[Comment]:
+        """Commentaires, désérialisés au premier accès"""
+        if self._raw_comments is not None:
+            self._comments = [
+                Comment._from_fields(comment_id, content, iso_to_epoch_us(created_at))
+                for comment_id, content, created_at in self._raw_comments
+            ]
+            self._raw_comments = None
+        elif self._comments is None:
+            self._comments = []
+        return self._comments
+
+    @comments.setter
+    def comments(self, comments: List[Comment]):
+        old_ids = self._comment_ids()
+        self._comments = comments
+        self._raw_comments = None
+
+        new_ids = [c.id for c in comments]
+        if new_ids != old_ids:
+            if self._changes is None:
+                self._changes = TaskChanges()
+            old, new = set(old_ids), set(new_ids)
+            self._changes.add_comment_changes(
+                [i for i in new_ids if i not in old],
+                [i for i in old_ids if i not in new]
+            )
+
+    def comment_contents(self) -> List[str]:
+        """Textes des commentaires, sans désérialiser les Comment"""
+        if self._raw_comments is not None:
+            return [c[1] for c in self._raw_comments]
+        return [c.content for c in self._comments or ()]
+
     def _validate_dates(self):
         """Règle métier : end_date > start_date"""
-        if self.start_date and self.end_date:
-            if self.end_date < self.start_date:
+        if self._start_us is not None and self._end_us is not None:
+            if self._end_us < self._start_us:
                 raise ValueError("Date de fin avant date de début")
     
+    def check_update(
+        self,
+        title: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        """
+        Vérifie, sans rien modifier, qu'update accepterait ces valeurs.
+
+        Raises:
+            ValueError: titre vide ou date de fin avant la date de début
+        """
+        if title is not None and not title.strip():
+            raise ValueError("Titre vide interdit")
+
+        start_us = to_epoch_us(start_date) if start_date is not None else self._start_us
+        end_us = to_epoch_us(end_date) if end_date is not None else self._end_us
+        if start_us is not None and end_us is not None and end_us < start_us:
+            raise ValueError("Date de fin avant date de début")
+
     def update(
         self,
         title: Optional[str] = None,
@@ -91,9 +342,10 @@ class Task:
             end_date: Nouvelle date de fin (optionnel)
             state: Nouvel état (optionnel)
         """
+        # Valide d'abord : une modification refusée ne laisse aucun champ à moitié changé
+        self.check_update(title, start_date, end_date)
+
         if title is not None:
-            if not title.strip():
-                raise ValueError("Titre vide interdit")
             self.title = title.strip()
         
         if description is not None:
@@ -111,7 +363,6 @@ class Task:
         if waiting_for is not None:
           self.waiting_for = waiting_for
     
-        self._validate_dates()
         self.updated_at = datetime.now()
 
     def add_comment(self, comment):
@@ -122,6 +373,9 @@ class Task:
           comment: Instance de Comment à ajouter
       """
       self.comments.append(comment)
+      if self._changes is None:
+          self._changes = TaskChanges()
+      self._changes.add_comment_changes(added=[comment.id])
       self.updated_at = datetime.now()
 
     
@@ -179,16 +433,19 @@ class Task:
             "end_date": self.end_date.isoformat() if self.end_date else None,
             "state": self.state.value,  # Enum -> string
             "waiting_for": self.waiting_for,
-            "comments": [c.to_dict() for c in self.comments],
+            # Commentaires jamais lus : réécrits tels quels, sans aller-retour par Comment
+            "comments": [
+                {"id": comment_id, "content": content, "created_at": created_at}
+                for comment_id, content, created_at in self._raw_comments
+            ] if self._raw_comments is not None else [c.to_dict() for c in self._comments or ()],
             "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "updated_at": self.updated_at.isoformat(),
+            "version": self.version
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
         """Pour charger depuis JSON"""
-        from models.comment import Comment
-        
         task = cls(
             title=data["title"],
             description=data.get("description", ""),
@@ -202,8 +459,108 @@ class Task:
         # Restaure les timestamps
         task.created_at = datetime.fromisoformat(data["created_at"])
         task.updated_at = datetime.fromisoformat(data["updated_at"])
+        task.version = data.get("version", 0)
         
-        # Restaure les commentaires
-        task.comments = [Comment.from_dict(c) for c in data.get("comments", [])]
-        
-        return task
\ No newline at end of file
+        # Commentaires gardés bruts jusqu'au premier accès (la liste n'affiche que les titres)
+        task._raw_comments = _compact_comments(data.get("comments"))
+
+        task._changes = None  # Reflète l'état stocké
+        return task
+
+    # ========== CHARGEMENT RAPIDE (données écrites par PyTasks) ==========
+
+    @classmethod
+    def _from_fields(
+        cls,
+        task_id: str,
+        title: str,
+        description: str,
+        state: TaskState,
+        waiting_for: Optional[str],
+        start_us: Optional[int],
+        end_us: Optional[int],
+        created_us: int,
+        updated_us: int,
+        version: int = 0,
+        raw_comments: Optional[Tuple[RawComment, ...]] = None
+    ) -> 'Task':
+        """
+        Construit une tâche déjà validée sans passer par __init__ (dates en
+        microsecondes, commentaires bruts au format de _compact_comments)
+        """
+        task = cls.__new__(cls)
+        task.id = task_id
+        task._title = title
+        task._description = description
+        task._state = state
+        task._waiting_for = waiting_for
+        task._start_us = start_us
+        task._end_us = end_us
+        task._created_us = created_us
+        task._updated_us = updated_us
+        task.version = version
+        task._comments = None
+        task._raw_comments = raw_comments or None
+        task._changes = None  # Reflète l'état stocké
+        return task
+
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> 'Task':
+        """
+        Comme from_dict, sans la validation de __init__ (titre, dates) :
+        réservé aux données écrites par PyTasks lui-même.
+        Les dates ISO sont converties directement en entiers, sans garder de datetime.
+        """
+        return cls._from_fields(
+            data["id"],
+            data["title"],
+            data.get("description", ""),
+            _STATE_BY_VALUE[data["state"]],
+            data.get("waiting_for"),
+            iso_to_epoch_us(data.get("start_date")),
+            iso_to_epoch_us(data.get("end_date")),
+            iso_to_epoch_us(data["created_at"]),
+            iso_to_epoch_us(data["updated_at"]),
+            data.get("version", 0),
+            _compact_comments(data.get("comments"))
+        )
+
+    @classmethod
+    def from_trusted_dicts(cls, records: Iterable[dict]) -> List['Task']:
+        """
+        from_trusted_dict sur un lot d'enregistrements.
+        Les dates du lot sont décodées en une passe, fonctions et tables en
+        variables locales, ramasse-miettes suspendu.
+        """
+        from_fields = cls._from_fields
+        states = _STATE_BY_VALUE
+        compact = _compact_comments
+        fromisoformat = datetime.fromisoformat
+        epoch = EPOCH
+
+        def decode(text):
+            if not text:
+                return None
+            value = fromisoformat(text)
+            if value.tzinfo is not None:
+                return to_epoch_us(value)
+            delta = value - epoch
+            return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+        with paused_gc():
+            return [
+                from_fields(
+                    data["id"],
+                    data["title"],
+                    data.get("description", ""),
+                    states[data["state"]],
+                    data.get("waiting_for"),
+                    decode(data.get("start_date")),
+                    decode(data.get("end_date")),
+                    decode(data["created_at"]),
+                    decode(data["updated_at"]),
+                    data.get("version", 0),
+                    compact(data.get("comments"))
+                )
+                for data in records
+            ]
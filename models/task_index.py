@@ -0,0 +1,141 @@
+"""
+Index secondaires en mémoire : état → IDs et dépendances inverses (waiting_for).
+
+Un filtre par état ou la question « quelles tâches attendent X ? » coûtent
+alors un temps proportionnel au résultat et non au nombre total de tâches.
+
+Les deux sens de waiting_for forment le graphe des dépendances : chaîne des
+bloqueurs, détection de cycles et ordre de démarrage se calculent sans
+relire les tâches.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from models.task import Task, TaskState
+
+
+class TaskIndex:
+    """Index état → IDs et ID → IDs des tâches qui l'attendent"""
+
+    def __init__(self):
+        # Dict utilisés comme ensembles ordonnés
+        self._ids_by_state: Dict[TaskState, Dict[str, None]] = {state: {} for state in TaskState}
+        self._dependents: Dict[str, Dict[str, None]] = {}
+
+        # Valeurs indexées, pour pouvoir retirer une tâche déjà modifiée en mémoire
+        self._state_of: Dict[str, TaskState] = {}
+        self._waiting_of: Dict[str, str] = {}
+
+    def add(self, task: Task):
+        """Indexe (ou réindexe) une tâche"""
+        self.add_entry(task.id, task.state, task.waiting_for)
+
+    def add_entry(self, task_id: str, state: TaskState, waiting_for: Optional[str]):
+        """
+        Indexe (ou réindexe) une tâche à partir des seules colonnes indexées.
+        Seules les parties qui changent sont déplacées : une tâche réindexée
+        sans changement d'état garde sa place dans la liste de cet état.
+        """
+        previous_state = self._state_of.get(task_id)
+        if previous_state != state:
+            if previous_state is not None:
+                self._ids_by_state[previous_state].pop(task_id, None)
+            self._ids_by_state[state][task_id] = None
+            self._state_of[task_id] = state
+
+        waiting_for = waiting_for or None
+        previous_waiting = self._waiting_of.get(task_id)
+        if previous_waiting != waiting_for:
+            if previous_waiting is not None:
+                del self._waiting_of[task_id]
+                dependents = self._dependents[previous_waiting]
+                dependents.pop(task_id, None)
+                if not dependents:
+                    del self._dependents[previous_waiting]
+            if waiting_for is not None:
+                self._dependents.setdefault(waiting_for, {})[task_id] = None
+                self._waiting_of[task_id] = waiting_for
+
+    def remove(self, task_id: str):
+        """Retire une tâche de l'index"""
+        state = self._state_of.pop(task_id, None)
+        if state is not None:
+            self._ids_by_state[state].pop(task_id, None)
+
+        waiting_for = self._waiting_of.pop(task_id, None)
+        if waiting_for is not None:
+            dependents = self._dependents[waiting_for]
+            dependents.pop(task_id, None)
+            if not dependents:
+                del self._dependents[waiting_for]
+
+    def ids_with_state(self, state: TaskState) -> List[str]:
+        """IDs des tâches dans cet état"""
+        return list(self._ids_by_state[state])
+
+    def dependents_of(self, task_id: str) -> List[str]:
+        """IDs des tâches dont waiting_for vaut task_id"""
+        return list(self._dependents.get(task_id, ()))
+
+    def waiting_for(self, task_id: str) -> Optional[str]:
+        """ID de la tâche attendue, tel qu'indexé"""
+        return self._waiting_of.get(task_id)
+
+    # ========== GRAPHE DES DÉPENDANCES ==========
+
+    def blockers_of(self, task_id: str) -> List[str]:
+        """
+        Tâches qui empêchent task_id de démarrer, de la plus proche à la plus lointaine.
+        La chaîne s'arrête à la première dépendance réalisée ou absente
+        (supprimée ou archivée, donc clôturée).
+        """
+        blockers = []
+        seen = {task_id}
+        dependency = self._waiting_of.get(task_id)
+        while dependency is not None and dependency not in seen:
+            state = self._state_of.get(dependency)
+            if state is None or state == TaskState.DONE:
+                break
+            blockers.append(dependency)
+            seen.add(dependency)
+            dependency = self._waiting_of.get(dependency)
+        return blockers
+
+    def would_create_cycle(self, task_id: str, waiting_for_id: str) -> bool:
+        """Indique si « task_id attend waiting_for_id » fermerait une boucle"""
+        seen = set()
+        dependency = waiting_for_id
+        while dependency is not None and dependency not in seen:
+            if dependency == task_id:
+                return True
+            seen.add(dependency)
+            dependency = self._waiting_of.get(dependency)
+        return False
+
+    def dependency_order(self, states: Iterable[TaskState]) -> List[str]:
+        """
+        Tâches dans ces états, chacune après celles qui la bloquent (tri topologique).
+        Les tâches sans bloqueur (démarrables maintenant) viennent en tête, puis
+        celles bloquées par une tâche hors de ces états ; une tâche prise dans
+        un cycle n'apparaît pas.
+        """
+        states = set(states)
+        candidates = [task_id for state in states for task_id in self._ids_by_state[state]]
+        startable, blocked_outside = [], []
+        for task_id in candidates:
+            if not self.blockers_of(task_id):
+                startable.append(task_id)
+            elif self._state_of.get(self._waiting_of[task_id]) not in states:
+                blocked_outside.append(task_id)
+        queue = deque(startable + blocked_outside)
+
+        order = []
+        seen = set(queue)
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent in self._dependents.get(task_id, ()):
+                if dependent not in seen and self._state_of.get(dependent) in states:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return order
@@ -1,98 +1,1072 @@
+import io
 import json
 import os
-from typing import List, Optional
-from models.task import Task, TaskState
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+from models.task import Task, TaskChanges, TaskState
+from utils.file_lock import FileLock
+from utils.gc_pause import paused_gc
+from models import binary_format
+from models.binary_format import FORMAT_BINARY, FORMAT_JSON, BinaryFormatError
+from models.offset_index import OffsetIndex
+from models.search_index import SearchIndex
+from models.snapshot_cache import SnapshotCache
+from models.task_index import TaskIndex
+from models.task_table import TaskTable
+
+CHUNK_SIZE = 64 * 1024
+
+# États clôturés, éligibles à l'archivage
+CLOSED_STATES = (TaskState.DONE, TaskState.ABANDONED)
+
+
+def _iter_json_array(f, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Parcourt un tableau JSON élément par élément sans charger tout le fichier.
+
+    Args:
+        f: Fichier texte ouvert, positionné au début du tableau
+        chunk_size: Nombre de caractères lus à la fois
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Saute les blancs et les séparateurs
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos >= len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Tableau JSON incomplet", buffer, pos)
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise json.JSONDecodeError("Tableau JSON attendu", buffer, pos)
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Élément coupé en fin de tampon : on lit la suite
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        yield element
+        pos = end
+
+
+class ConcurrentModificationError(Exception):
+    """Des tâches ont été modifiées par une autre instance depuis leur lecture"""
+
+    def __init__(self, task_ids: List[str]):
+        super().__init__(
+            f"{len(task_ids)} tâche(s) modifiée(s) par une autre instance : "
+            "vos changements sur celles-ci n'ont pas été enregistrés"
+        )
+        self.task_ids = task_ids
+
 
 class TaskRepository:
-    def __init__(self, file_path: str = "tasks.json"):
+    def __init__(
+        self,
+        file_path: str = "tasks.json",
+        use_cache: bool = True,
+        flush_delay: Optional[float] = None,
+        file_format: Optional[str] = None,
+        snapshot_cache: bool = False
+    ):
+        """
+        Initialise le repository.
+
+        Args:
+            file_path: Chemin du fichier de données
+            use_cache: Garde les tâches en mémoire (identity map) et ne relit
+                       le fichier que s'il a changé sur le disque (mtime/taille)
+            flush_delay: Mode write-behind : les changements sont regroupés et
+                         écrits en une fois après ce délai d'inactivité (secondes).
+                         None = écriture immédiate à chaque save/delete
+            file_format: Format des écritures ("json" ou "binary").
+                         None = celui du fichier existant (JSON pour un nouveau fichier).
+                         La lecture détecte toujours le format d'après l'en-tête
+            snapshot_cache: Garde un instantané des champs des tâches (fichier .cache),
+                            restauré au démarrage tant que le fichier n'a pas changé
+        """
         self.file_path = file_path
+        self.file_format = file_format or binary_format.detect_format(file_path) or FORMAT_JSON
+        self.use_cache = use_cache
+        self.flush_delay = flush_delay
+
+        # Identity map : une seule instance de Task par ID
+        self._tasks: Dict[str, Task] = {}
+        self._base_versions: Dict[str, int] = {}  # Version de chaque tâche lue sur le disque
+        self._signature: Optional[tuple] = None  # Signature du stockage chargé (cf. _file_signature)
+        self._generation: Optional[int] = None  # Génération chargée (cf. FileLock.read_generation)
+        self._lock = threading.RLock()
+
+        # Write-behind : changements en attente d'écriture
+        self._pending_saved: Dict[str, Task] = {}
+        self._pending_deleted: Set[str] = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Appelé si une écriture différée échoue (ex: ConcurrentModificationError)
+        self.on_flush_error: Optional[Callable[[Exception], None]] = None
+
+        # Index ID → position des enregistrements dans le fichier (find_by_id à froid)
+        self._offset_index: Optional[OffsetIndex] = OffsetIndex(file_path)
+
+        # Index plein texte, construit à la première recherche puis tenu à jour
+        self._search_index: Optional[SearchIndex] = None
+
+        # Index état → IDs et dépendances inverses, tenus à jour à chaque changement
+        self._task_index: Optional[TaskIndex] = None
+
+        # Colonnes pour les statistiques, construites à la première requête puis tenues à jour
+        self._task_table: Optional[TaskTable] = None
+
+        # Archive des tâches clôturées (tasks.archive.json), ouverte seulement si besoin
+        root, ext = os.path.splitext(file_path)
+        self.archive_path = f"{root}.archive{ext}"
+        self._archive: Optional['TaskRepository'] = None
+
+        # Transaction en cours : changements regroupés jusqu'à la sortie du bloc
+        self._transaction: Optional[Dict[str, list]] = None
+
+        # Verrou inter-processus, pris uniquement pendant les écritures
+        self._file_lock = FileLock(file_path + ".lock")
+
+        # Instantané des tâches désérialisées, enregistré à la fermeture (close)
+        self._snapshot_cache: Optional[SnapshotCache] = (
+            SnapshotCache(file_path + ".cache", self._snapshot_sources()) if snapshot_cache else None
+        )
+
         self._ensure_file_exists()
-    
+
     def _ensure_file_exists(self):
         """Crée le fichier s'il n'existe pas"""
         if not os.path.exists(self.file_path):
-            with open(self.file_path, 'w') as f:
-                json.dump([], f)
-    
-    def load_all(self) -> List[Task]:
-        """Charge toutes les tâches"""
+            if self.file_format == FORMAT_BINARY:
+                with open(self.file_path, 'wb') as f:
+                    f.write(binary_format.MAGIC)
+            else:
+                with open(self.file_path, 'w') as f:
+                    json.dump([], f)
+
+    # ========== CACHE ==========
+
+    def _file_signature(self) -> Optional[tuple]:
+        """Retourne (mtime_ns, taille) du fichier, ou None s'il n'existe pas"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [Task.from_dict(task_data) for task_data in data]
-        except json.JSONDecodeError:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _iter_snapshot(self) -> Iterator[Task]:
+        """Désérialise le fichier tâche par tâche, au format indiqué par son en-tête"""
+        with open(self.file_path, 'rb') as f:
+            if f.read(len(binary_format.MAGIC))[:-1] == binary_format.MAGIC[:-1]:
+                f.seek(0)
+                yield from binary_format.iter_tasks(f)
+                return
+
+            f.seek(0)
+            with io.TextIOWrapper(f, encoding='utf-8') as text:
+                for task_data in _iter_json_array(text):
+                    yield Task.from_trusted_dict(task_data)
+
+    def _iter_file(self) -> Iterator[Task]:
+        """Désérialise les tâches au fil de la lecture"""
+        return self._iter_snapshot()
+
+    def _snapshot_sources(self) -> List[str]:
+        """Fichiers dont le contenu détermine les tâches (clé du cache de démarrage)"""
+        return [self.file_path]
+
+    def _load_tasks(self) -> List[Task]:
+        """Charge toutes les tâches, depuis le cache de démarrage s'il est à jour"""
+        if self._snapshot_cache is not None:
+            tasks = self._snapshot_cache.load()
+            if tasks is not None:
+                return tasks
+        return self._read_file()
+
+    def _read_file(self) -> List[Task]:
+        """Lit et désérialise tout le fichier"""
+        try:
+            with paused_gc():
+                return list(self._iter_file())
+        except (json.JSONDecodeError, BinaryFormatError):
             return []  # Fichier corrompu = liste vide
-    
+
+    def _decode_record(self, record: bytes) -> Task:
+        """Désérialise un enregistrement lu via l'index annexe"""
+        if binary_format.detect_format(self.file_path) == FORMAT_BINARY:
+            return binary_format.decode_task(record)
+        return Task.from_trusted_dict(json.loads(record))
+
+    def _write_file(self, tasks: List[Task]):
+        """
+        Réécrit tout le fichier de façon atomique (fichier temporaire + fsync + rename).
+        En JSON, même format que json.dump(indent=2). Sans identity map
+        (use_cache=False), la position de chaque tâche est notée dans l'index
+        annexe ; avec, find_by_id ne le lit jamais et réécrire l'index à chaque
+        sauvegarde serait du travail perdu : l'ancien index, périmé, est ignoré.
+        """
+        if self.file_format == FORMAT_BINARY:
+            content, offsets = binary_format.encode_file(tasks)
+        else:
+            offsets = {}
+            records = []
+            position = 2  # "[\n"
+            for task in tasks:
+                text = json.dumps(task.to_dict(), ensure_ascii=False, indent=2)
+                record = ("  " + text.replace("\n", "\n  ")).encode('utf-8')
+                offsets[task.id] = (position, len(record))
+                records.append(record)
+                position += len(record) + 2  # ",\n"
+            content = b"[\n" + b",\n".join(records) + b"\n]" if records else b"[]"
+
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+
+        if self._offset_index and not self.use_cache:
+            self._offset_index.write(offsets)
+
+    def _is_fresh(self) -> bool:
+        """Indique si l'identity map reflète le fichier sans relecture"""
+        if self._has_pending_changes():
+            return True
+        return self.use_cache and self._signature is not None and self._file_signature() == self._signature
+
+    def _refresh(self) -> Dict[str, Task]:
+        """
+        Retourne l'identity map à jour.
+        Le fichier n'est relu que s'il a été modifié depuis le dernier chargement.
+        Tant que des changements attendent d'être écrits, la mémoire fait foi.
+        """
+        if not self._is_fresh():
+            # Sous verrou : la génération notée correspond exactement aux données lues
+            with self._file_lock:
+                generation = self._file_lock.read_generation()
+                signature = self._file_signature()
+                tasks = self._load_tasks()
+            self._set_tasks({task.id: task for task in tasks}, signature, generation)
+        return self._tasks
+
+    def _set_tasks(
+        self,
+        tasks: Dict[str, Task],
+        signature: Optional[tuple],
+        generation: Optional[int] = None
+    ):
+        """
+        Remplace l'identity map (les index dérivés seront reconstruits).
+        Sans génération connue, la prochaine écriture relira le disque.
+        """
+        transaction = self._transaction
+        if transaction is not None:
+            # Rechargé pendant une transaction (écriture d'une autre instance) :
+            # une tâche touchée par le bloc dont la version sur le disque a changé
+            # est en conflit ; les changements du bloc sont réappliqués par-dessus
+            for task_id in (*transaction["saved"], *transaction["deleted"]):
+                disk_task = tasks.get(task_id)
+                disk_version = disk_task.version if disk_task is not None else None
+                if disk_version != self._base_versions.get(task_id):
+                    transaction["conflicts"][task_id] = None
+            base_versions = {task_id: task.version for task_id, task in tasks.items()}
+            tasks.update(transaction["saved"])
+            for task_id in transaction["deleted"]:
+                tasks.pop(task_id, None)
+        else:
+            base_versions = {task_id: task.version for task_id, task in tasks.items()}
+
+        # waiting_for partage la chaîne de l'ID de la tâche attendue au lieu d'une copie
+        for task in tasks.values():
+            if task.waiting_for:
+                target = tasks.get(task.waiting_for)
+                if target is not None:
+                    task._waiting_for = target.id
+
+        self._tasks = tasks
+        self._signature = signature
+        self._generation = generation
+        self._base_versions = base_versions
+        self._search_index = None
+        self._task_index = None
+        self._task_table = None
+
+    def _persist_changes(self, saved: List[Task], deleted: List[str], atomic: bool = False):
+        """
+        Répercute les changements sur le disque, sous verrou de fichier.
+        Si une autre instance a écrit entre-temps, ses changements sont
+        fusionnés ; les tâches modifiées des deux côtés sont rejetées.
+
+        Args:
+            saved: Tâches créées ou modifiées
+            deleted: IDs des tâches supprimées
+            atomic: Tout ou rien : un seul conflit fait rejeter tous les changements
+
+        Raises:
+            ConcurrentModificationError: si certains changements ont dû être
+                rejetés, après avoir écrit les autres (sauf si atomic)
+        """
+        with self._file_lock:
+            saved, deleted, conflicts = self._merge_concurrent_changes(saved, deleted, atomic)
+            if conflicts and atomic:
+                raise ConcurrentModificationError(conflicts)  # Rien n'a été écrit
+
+            # Champs modifiés de chaque tâche écrite ; remis en attente si l'écriture échoue
+            changes = {task.id: task._take_changes() for task in saved}
+            for task in saved:
+                task.version += 1
+
+            # Annoncée avant d'écrire : une écriture interrompue force la relecture des autres instances
+            generation = self._file_lock.next_generation()
+            try:
+                self._write_changes(saved, deleted, changes)
+            except BaseException:
+                for task in saved:
+                    task.version -= 1
+                    task._restore_changes(changes[task.id])
+                self._generation = None
+                raise
+            self._signature = self._file_signature()
+            self._generation = generation
+
+            for task in saved:
+                self._base_versions[task.id] = task.version
+            for task_id in deleted:
+                self._base_versions.pop(task_id, None)
+
+        if conflicts:
+            raise ConcurrentModificationError(conflicts)
+
+    def _write_changes(
+        self,
+        saved: List[Task],
+        deleted: List[str],
+        changes: Dict[str, Optional[TaskChanges]]
+    ):
+        """
+        Écrit les changements (appelé sous verrou).
+        Le stockage JSON réécrit tout le fichier depuis l'identity map ;
+        les autres stockages peuvent n'écrire que saved/deleted, voire
+        seulement les champs modifiés (changes : ID → changements, None si inconnus).
+        """
+        self._write_file(self._tasks_to_write(saved))
+
+    def _tasks_to_write(self, saved: List[Task]) -> List[Task]:
+        """
+        Tâches à réécrire dans un fichier complet, dans l'ordre de l'identity map
+        (appelé sous verrou). Une tâche modifiée en mémoire sans avoir été
+        sauvegardée est écrite dans son état persisté, relu sur le disque.
+        """
+        saved_ids = {task.id for task in saved}
+        unsaved = [
+            task_id for task_id, task in self._tasks.items()
+            if task_id not in saved_ids and task.changes()
+        ]
+        if not unsaved:
+            return list(self._tasks.values())
+
+        persisted = self._read_persisted(unsaved)
+        unsaved = set(unsaved)
+        tasks = []
+        for task_id, task in self._tasks.items():
+            if task_id not in unsaved:
+                tasks.append(task)
+            elif task_id in persisted:
+                tasks.append(persisted[task_id])
+            # Absente du disque : jamais sauvegardée, rien à écrire
+        return tasks
+
+    def _read_persisted(self, task_ids: List[str]) -> Dict[str, Task]:
+        """Version sur le disque des tâches données, via l'index annexe si possible"""
+        if self._offset_index:
+            persisted = {}
+            for task_id in task_ids:
+                record = self._offset_index.read_record(task_id)
+                if record is None:
+                    break  # Index inutilisable : relecture complète
+                if record:
+                    persisted[task_id] = self._decode_record(record)
+            else:
+                return persisted
+
+        disk = {task.id: task for task in self._read_file()}
+        return {task_id: disk[task_id] for task_id in task_ids if task_id in disk}
+
+    def _merge_concurrent_changes(self, saved: List[Task], deleted: List[str], atomic: bool = False):
+        """
+        Rapproche nos changements de l'état actuel du disque (appelé sous verrou).
+        Une tâche est en conflit si sa version sur le disque n'est plus celle
+        à partir de laquelle elle a été modifiée.
+        Le disque a changé si le compteur de générations a avancé (écriture d'une
+        autre instance, même dans le même tick d'horloge et à taille égale) ou
+        si sa signature a changé (fichier modifié par un autre outil).
+
+        Returns:
+            (tâches à écrire, IDs à supprimer, IDs en conflit)
+        """
+        generation = self._file_lock.read_generation()
+        signature = self._file_signature()
+        disk = None
+        if generation != self._generation or signature != self._signature:
+            # Une autre instance a écrit depuis notre dernière lecture
+            disk = {task.id: task for task in self._read_file()}
+            disk_versions = {task_id: task.version for task_id, task in disk.items()}
+        else:
+            disk_versions = self._base_versions
+
+        accepted_saved, accepted_deleted, conflicts = [], [], []
+
+        for task in saved:
+            current = disk_versions.get(task.id)
+            # Modifiée depuis la version du disque (0 : fichier antérieur aux versions),
+            # ou nouvelle (version 0, absente du disque) ; une tâche déjà écrite
+            # mais absente a été supprimée par une autre instance
+            if current == task.version or (current is None and not task.version):
+                accepted_saved.append(task)
+            else:
+                conflicts.append(task.id)
+
+        for task_id in deleted:
+            current = disk_versions.get(task_id)
+            if current is None or current == self._base_versions.get(task_id):
+                accepted_deleted.append(task_id)
+            else:
+                conflicts.append(task_id)
+
+        if disk is None and not conflicts:
+            return saved, deleted, []
+        if conflicts and atomic:
+            return [], [], conflicts  # Rien ne sera écrit : la mémoire est laissée à l'appelant
+
+        # Repart du disque et y applique les changements acceptés
+        if disk is None:
+            disk = {task.id: task for task in self._read_file()}
+        for task in accepted_saved:
+            disk[task.id] = task
+        for task_id in accepted_deleted:
+            disk.pop(task_id, None)
+        self._set_tasks(disk, signature, generation)
+
+        return accepted_saved, accepted_deleted, conflicts
+
+    # ========== WRITE-BEHIND ==========
+
+    def _has_pending_changes(self) -> bool:
+        return bool(self._pending_saved or self._pending_deleted)
+
+    def _record_changes(self, saved: List[Task], deleted: List[str]):
+        """Écrit immédiatement, ou met en attente (transaction, mode write-behind)"""
+        # Les requêtes suivantes, même dans une transaction, voient les changements
+        self._update_indexes(saved, deleted)
+
+        if self._transaction is not None:
+            # Gardés à part de l'identity map, qui peut être rechargée pendant le bloc
+            for task in saved:
+                self._transaction["deleted"].pop(task.id, None)
+                self._transaction["saved"][task.id] = task
+            for task_id in deleted:
+                self._transaction["saved"].pop(task_id, None)
+                self._transaction["deleted"][task_id] = None
+            return
+
+        if self.flush_delay is None:
+            self._persist_changes(saved, deleted)
+            return
+
+        for task in saved:
+            self._pending_deleted.discard(task.id)
+            self._pending_saved[task.id] = task
+        for task_id in deleted:
+            self._pending_saved.pop(task_id, None)
+            self._pending_deleted.add(task_id)
+
+        # Debounce : chaque changement repousse l'écriture
+        if self._flush_timer:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.flush_delay, self._background_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        """Écrit immédiatement les changements en attente (tests, fermeture de l'application)"""
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if not self._has_pending_changes():
+                return
+
+            saved = list(self._pending_saved.values())
+            deleted = list(self._pending_deleted)
+            self._pending_saved.clear()
+            self._pending_deleted.clear()
+
+            try:
+                self._persist_changes(saved, deleted)
+            except ConcurrentModificationError:
+                raise  # Les changements sans conflit ont été écrits, les autres abandonnés
+            except Exception:
+                # Rien n'a été écrit : les changements restent en attente
+                self._pending_saved.update({task.id: task for task in saved})
+                self._pending_deleted.update(deleted)
+                raise
+
+    def close(self):
+        """
+        Écrit les changements en attente puis, si activé, l'instantané de
+        démarrage (à appeler à la fermeture de l'application).
+        """
+        with self._lock:
+            self.flush()
+
+            if self._snapshot_cache is None or not self.use_cache:
+                return
+            # La mémoire doit refléter exactement le fichier
+            if self._signature is None or self._file_signature() != self._signature:
+                return
+            if not self._snapshot_cache.is_valid():
+                self._snapshot_cache.store(self._tasks_to_write([]))
+
+    def _background_flush(self):
+        """Écriture différée déclenchée par le timer (hors thread appelant)"""
+        try:
+            self.flush()
+        except Exception as e:
+            if self.on_flush_error:
+                self.on_flush_error(e)
+            else:
+                print(f"⚠️ Écriture différée échouée : {e}")
+
+    # ========== INDEX ==========
+
+    def _update_indexes(self, saved: List[Task], deleted: List[str]):
+        """Répercute les changements sur les index en mémoire"""
+        if self._search_index is not None:
+            for task in saved:
+                self._index_task(task)
+            for task_id in deleted:
+                self._search_index.remove(task_id)
+
+        if self._task_index is not None:
+            for task in saved:
+                self._task_index.add(task)
+            for task_id in deleted:
+                self._task_index.remove(task_id)
+
+        if self._task_table is not None:
+            for task in saved:
+                self._task_table.add(task)
+            for task_id in deleted:
+                self._task_table.remove(task_id)
+
+    def _index_task(self, task: Task):
+        self._search_index.add(task.id, task.title, task.description, task.comment_contents())
+
+    def _get_search_index(self) -> SearchIndex:
+        """Index plein texte à jour (construit au premier appel)"""
+        tasks = self._refresh()
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            for task in tasks.values():
+                self._index_task(task)
+        return self._search_index
+
+    def _get_task_index(self) -> TaskIndex:
+        """Index état/dépendances à jour (construit au premier appel)"""
+        tasks = self._refresh()
+        if self._task_index is None:
+            self._task_index = TaskIndex()
+            for task in tasks.values():
+                self._task_index.add(task)
+        return self._task_index
+
+    def _get_task_table(self) -> TaskTable:
+        """Vue en colonnes à jour (construite au premier appel)"""
+        tasks = self._refresh()
+        if self._task_table is None:
+            self._task_table = TaskTable()
+            for task in tasks.values():
+                self._task_table.add(task)
+        return self._task_table
+
+    # ========== TRANSACTIONS ==========
+
+    @contextmanager
+    def transaction(self) -> Iterator['TaskRepository']:
+        """
+        Regroupe les save/delete du bloc en un seul chargement et une seule écriture.
+        Tout ou rien : si le bloc lève une exception, ou si une seule tâche est
+        en conflit avec une autre instance (ConcurrentModificationError), rien
+        n'est écrit et l'état est rechargé depuis le disque. Si une autre
+        instance écrit pendant le bloc, ses changements sont relus et ceux du
+        bloc réappliqués par-dessus.
+        L'écriture a lieu à la sortie du bloc, même en mode write-behind :
+        son échec est levé ici et non dans le thread d'écriture différée.
+
+        Exemple:
+            with repository.transaction():
+                for task in tasks:
+                    task.close_task()
+                    repository.save(task)
+        """
+        with self._lock:
+            # Transaction imbriquée : rattachée à la transaction englobante
+            if self._transaction is not None:
+                yield self
+                return
+
+            # Le disque doit refléter la mémoire pour pouvoir annuler
+            self.flush()
+            self._refresh()
+            # Dict utilisés comme ensembles ordonnés (ID → tâche pour saved)
+            self._transaction = {"saved": {}, "deleted": {}, "conflicts": {}}
+
+            try:
+                yield self
+            except BaseException:
+                self._transaction = None
+                self._set_tasks({}, None)
+                raise
+
+            changes = self._transaction
+            self._transaction = None
+
+            saved = list(changes["saved"].values())
+            deleted = list(changes["deleted"])
+            if not saved and not deleted:
+                return
+
+            try:
+                if changes["conflicts"]:
+                    raise ConcurrentModificationError(list(changes["conflicts"]))
+                self._persist_changes(saved, deleted, atomic=True)
+            except BaseException:
+                self._set_tasks({}, None)  # Index compris : reconstruits depuis le disque
+                raise
+
+    def invalidate(self):
+        """Force la relecture du fichier au prochain accès"""
+        self._signature = None
+
+    def convert(self, file_format: str):
+        """
+        Réécrit le fichier dans l'autre format ("json" ou "binary").
+        Les écritures suivantes utilisent ce format.
+        """
+        if file_format not in (FORMAT_JSON, FORMAT_BINARY):
+            raise ValueError(f"Format inconnu : {file_format}")
+
+        with self._lock:
+            self.flush()
+            with self._file_lock:
+                self._refresh()
+                tasks = self._tasks_to_write([])
+                self.file_format = file_format
+                self._generation = None
+                generation = self._file_lock.next_generation()
+                self._write_file(tasks)
+                self._signature = self._file_signature()
+                self._generation = generation
+
+    # ========== CRUD ==========
+
+    def load_all(self) -> List[Task]:
+        """Charge toutes les tâches"""
+        with self._lock:
+            return list(self._refresh().values())
+
     def save(self, task: Task):
         """Sauvegarde/Update une tâche"""
-        tasks = self.load_all()
-        
-        # Cherche si déjà existante
-        for i, t in enumerate(tasks):
-            if t.id == task.id:
-                tasks[i] = task  # Update
-                break
-        else:
-            tasks.append(task)  # Create
-        
-        # Sauvegarde tout
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump([t.to_dict() for t in tasks], f, ensure_ascii=False, indent=2)
-    
+        with self._lock:
+            tasks = self._refresh()
+
+            # Tâche archivée (ex: commentaire ajouté) : reste dans l'archive
+            if task.id not in tasks and task.version and self._find_archived(task.id):
+                self._get_archive().save(task)
+                return
+
+            # Déjà en mémoire et rien de modifié : rien à écrire
+            if tasks.get(task.id) is task and not task.changes():
+                return
+
+            # Update si déjà existante (garde la position), sinon Create
+            tasks[task.id] = task
+
+            self._record_changes([task], [])
+
+    def modify(self, task: Task, change: Callable[[Task], None]) -> FrozenSet[str]:
+        """
+        Modifie puis sauvegarde une tâche sous le verrou du repository :
+        une écriture différée ne peut pas lire la tâche à moitié modifiée.
+
+        Args:
+            task: Tâche à modifier
+            change: Fonction appliquant les modifications (ex: lambda t: t.close_task())
+
+        Returns:
+            Les champs modifiés
+        """
+        with self._lock:
+            change(task)
+            fields = task.changes().changed_fields()  # Relevé avant l'écriture, qui le remet à zéro
+            self.save(task)
+            return fields
+
     def delete(self, task_id: str) -> bool:
-        """Supprime une tâche par son ID"""
-        tasks = self.load_all()
-        initial_length = len(tasks)
-        
-        # Filtre : garde toutes les tâches SAUF celle à supprimer
-        tasks = [t for t in tasks if t.id != task_id]
-        
-        # Si la liste est plus courte, on a bien supprimé quelque chose
-        if len(tasks) < initial_length:
-            # Sauvegarde la nouvelle liste sans la tâche supprimée
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    [t.to_dict() for t in tasks],
-                    f,
-                    ensure_ascii=False,
-                    indent=2
-                )
+        """Supprime une tâche par son ID (dans l'archive si elle y est)"""
+        with self._lock:
+            tasks = self._refresh()
+
+            if task_id not in tasks:
+                # Tâche archivée (listée via include_archive ou un filtre clôturé)
+                if os.path.exists(self.archive_path):
+                    return self._get_archive().delete(task_id)
+                return False  # Aucune tâche trouvée avec cet ID
+
+            del tasks[task_id]
+            self._record_changes([], [task_id])
             return True  # Suppression réussie
-        
-        return False  # Aucune tâche trouvée avec cet ID
-    
-    def search(self, query: str, state_filter: Optional[TaskState] = None) -> List[Task]:
-        """Recherche + filtre"""
-        tasks = self.load_all()
+
+    def save_many(self, tasks: Iterable[Task]):
+        """Sauvegarde plusieurs tâches en une seule écriture"""
+        tasks = list(tasks)
+        with self._lock:
+            current = self._refresh()
+            # Les tâches déjà en mémoire et non modifiées sont ignorées
+            tasks = [task for task in tasks if current.get(task.id) is not task or task.changes()]
+            for task in tasks:
+                current[task.id] = task
+            if tasks:
+                self._record_changes(tasks, [])
+
+    def delete_many(self, task_ids: Iterable[str]) -> int:
+        """
+        Supprime plusieurs tâches en une seule écriture
+        (plus une dans l'archive pour les tâches archivées).
+
+        Returns:
+            Nombre de tâches effectivement supprimées
+        """
+        with self._lock:
+            current = self._refresh()
+            deleted, missing = [], []
+            for task_id in dict.fromkeys(task_ids):
+                (deleted if current.pop(task_id, None) else missing).append(task_id)
+            if deleted:
+                self._record_changes([], deleted)
+
+            archived = 0
+            if missing and os.path.exists(self.archive_path):
+                archived = self._get_archive().delete_many(missing)
+            return len(deleted) + archived
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """
+        Parcourt les tâches au fil de la lecture du fichier.
+        Les premières tâches sont disponibles avant la fin du chargement ;
+        sans cache, la mémoire reste bornée. Avec cache, un parcours complet le remplit.
+        """
+        with self._lock:
+            if self._is_fresh() or self._snapshot_cache is not None:
+                # Avec le cache de démarrage, un chargement complet est plus rapide que le flux
+                cached = list(self._refresh().values())
+            else:
+                cached = None
+                with self._file_lock:
+                    generation = self._file_lock.read_generation()
+                    signature = self._file_signature()
+
+        if cached is not None:
+            yield from cached
+            return
+
+        loaded: Dict[str, Task] = {}
+        try:
+            for task in self._iter_file():
+                if self.use_cache:
+                    loaded[task.id] = task
+                yield task
+        except (json.JSONDecodeError, BinaryFormatError):
+            return  # Fichier corrompu = on s'arrête là
+
+        # Parcours complet : installe le résultat si aucune écriture n'a commencé entre-temps
+        with self._lock:
+            if self.use_cache and not self._is_fresh():
+                with self._file_lock:
+                    unchanged = (
+                        self._file_lock.read_generation() == generation
+                        and self._file_signature() == signature
+                    )
+                if unchanged:
+                    self._set_tasks(loaded, signature, generation)
+
+    def search(
+        self,
+        query: str,
+        state_filter: Optional[TaskState] = None,
+        limit: Optional[int] = None,
+        include_archive: bool = False
+    ) -> List[Task]:
+        """
+        Recherche + filtre.
+        Avec un texte, interroge l'index plein texte (titre, description,
+        commentaires ; tous les mots, en préfixe) et classe par pertinence.
+
+        Args:
+            query: Texte recherché
+            state_filter: État à conserver (optionnel)
+            limit: Nombre maximum de résultats ; la lecture s'arrête dès qu'il est atteint
+            include_archive: Cherche aussi dans l'archive (automatique si on filtre
+                             sur un état clôturé)
+        """
+        if query and query.strip():
+            with self._lock:
+                index = self._get_search_index()
+                tasks = [self._tasks[task_id] for task_id, _ in index.search(query)]
+        elif state_filter:
+            tasks = self.find_by_state(state_filter)
+        else:
+            tasks = self.iter_tasks()
+
         results = []
-        
-        query_lower = query.lower() if query else ""
-        
         for task in tasks:
             # Filtre par état
             if state_filter and task.state != state_filter:
                 continue
-            
-            # Recherche dans titre (case-insensitive)
-            if query and query_lower not in task.title.lower():
-                continue
-            
+
             results.append(task)
-        
+            if limit is not None and len(results) >= limit:
+                return results
+
+        # Archive : seulement si on la demande ou si on filtre sur les tâches clôturées
+        if (include_archive or state_filter in CLOSED_STATES) and os.path.exists(self.archive_path):
+            remaining = None if limit is None else limit - len(results)
+            found = {task.id for task in results}
+            with self._lock:
+                active_ids = set(self._tasks)
+            for task in self._get_archive().search(query, state_filter, remaining):
+                # Une tâche ressortie de l'archive (ex: nouveau commentaire) est déjà listée
+                if task.id not in found and task.id not in active_ids:
+                    results.append(task)
+
         return results
-    
+
+    def find_by_state(self, *states: TaskState) -> List[Task]:
+        """
+        Tâches dans l'un des états donnés (via l'index, sans parcourir toutes les tâches).
+
+        Args:
+            states: États recherchés
+        """
+        with self._lock:
+            index = self._get_task_index()
+            return [
+                self._tasks[task_id]
+                for state in states
+                for task_id in index.ids_with_state(state)
+                if self._tasks[task_id].state == state  # Ignore une modification non sauvegardée
+            ]
+
+    def find_waiting_on(self, task_id: str) -> List[Task]:
+        """
+        Tâches dont waiting_for désigne task_id.
+
+        Args:
+            task_id: ID de la tâche attendue
+        """
+        with self._lock:
+            index = self._get_task_index()
+            return [
+                self._tasks[dependent_id]
+                for dependent_id in index.dependents_of(task_id)
+                if self._tasks[dependent_id].waiting_for == task_id
+            ]
+
+    # ========== DÉPENDANCES ==========
+
+    def find_blockers(self, task_id: str) -> List[Task]:
+        """
+        Tâches non réalisées dont task_id dépend, directement ou par transitivité
+        (la plus proche d'abord). Vide si la tâche peut démarrer.
+        """
+        with self._lock:
+            index = self._get_task_index()
+            return [self._tasks[blocker_id] for blocker_id in index.blockers_of(task_id)]
+
+    def would_create_cycle(self, task_id: str, waiting_for_id: str) -> bool:
+        """
+        Indique si faire attendre waiting_for_id à task_id créerait une
+        dépendance circulaire (y compris une tâche qui s'attend elle-même).
+        """
+        with self._lock:
+            return self._get_task_index().would_create_cycle(task_id, waiting_for_id)
+
+    def find_startable(self, include_blocked: bool = False) -> List[Task]:
+        """
+        Tâches à faire ou en attente qu'aucune dépendance ne bloque.
+
+        Args:
+            include_blocked: Ajoute ensuite les tâches bloquées, chacune après ses
+                             bloqueurs (ordre dans lequel elles pourront démarrer)
+        """
+        with self._lock:
+            index = self._get_task_index()
+            order = index.dependency_order((TaskState.TODO, TaskState.WAITING))
+            if not include_blocked:
+                order = [task_id for task_id in order if not index.blockers_of(task_id)]
+            return [self._tasks[task_id] for task_id in order]
+
+    # ========== STATISTIQUES ==========
+
+    def count_by_state(self, include_archive: bool = False) -> Dict[TaskState, int]:
+        """
+        Nombre de tâches par état (calculé sur les colonnes, sans parcourir les tâches).
+
+        Args:
+            include_archive: Compte aussi les tâches archivées
+        """
+        with self._lock:
+            counts = self._get_task_table().count_by_state()
+
+        if include_archive and os.path.exists(self.archive_path):
+            for state, count in self._get_archive().count_by_state().items():
+                counts[state] += count
+        return counts
+
+    def find_overdue(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        Tâches dont la date de fin est passée sans qu'elles soient clôturées
+        (une tâche abandonnée n'est pas en retard).
+
+        Args:
+            now: Date de référence (par défaut maintenant)
+        """
+        now = now or datetime.now()
+        with self._lock:
+            task_ids = self._get_task_table().overdue_ids(now, CLOSED_STATES)
+            return [self._tasks[task_id] for task_id in task_ids]
+
+    def average_cycle_time(self, include_archive: bool = False) -> Optional[timedelta]:
+        """
+        Durée moyenne entre date de début et date de fin des tâches réalisées.
+
+        Args:
+            include_archive: Inclut les tâches archivées (la plupart des tâches réalisées anciennes)
+
+        Returns:
+            La durée moyenne, ou None si aucune tâche réalisée n'a ses deux dates
+        """
+        total, count = self._cycle_time_totals()
+
+        if include_archive and os.path.exists(self.archive_path):
+            archive_total, archive_count = self._get_archive()._cycle_time_totals()
+            total += archive_total
+            count += archive_count
+
+        if not count:
+            return None
+        return timedelta(microseconds=total / count)
+
+    def _cycle_time_totals(self):
+        """(somme en µs, nombre) des durées des tâches réalisées"""
+        with self._lock:
+            return self._get_task_table().cycle_time_totals((TaskState.DONE,))
+
     def find_by_id(self, task_id: str) -> Optional[Task]:
       """
       Trouve une tâche par son ID.
-      
+      O(1) via l'identity map. Sans identity map (use_cache=False), l'index
+      annexe permet de ne désérialiser que cette tâche ; avec, la tâche
+      renvoyée doit être celle de la map : elle est chargée en entier.
+
       Args:
           task_id: L'ID de la tâche à rechercher
-          
+
       Returns:
           La tâche trouvée ou None si elle n'existe pas
       """
-      tasks = self.load_all()
-      for task in tasks:
-          if task.id == task_id:
-              return task
-      return None
\ No newline at end of file
+      with self._lock:
+          if not self.use_cache and not self._has_pending_changes() and self._offset_index:
+              record = self._offset_index.read_record(task_id)
+              if record is not None:
+                  if record:
+                      return self._decode_record(record)
+                  return self._find_archived(task_id)
+
+          task = self._refresh().get(task_id)
+          return task if task else self._find_archived(task_id)
+
+    # ========== ARCHIVE ==========
+
+    def _get_archive(self) -> 'TaskRepository':
+        """Ouvre l'archive au premier besoin"""
+        if self._archive is None:
+            # Une nouvelle archive reprend le format du fichier principal
+            file_format = None if os.path.exists(self.archive_path) else self.file_format
+            self._archive = TaskRepository(self.archive_path, file_format=file_format)
+        return self._archive
+
+    def _find_archived(self, task_id: str) -> Optional[Task]:
+        """Cherche une tâche dans l'archive (ex: dépendance clôturée depuis longtemps)"""
+        if not os.path.exists(self.archive_path):
+            return None
+        return self._get_archive().find_by_id(task_id)
+
+    def archive_closed_tasks(self, max_age_days: float) -> int:
+        """
+        Déplace dans l'archive les tâches clôturées (réalisées ou abandonnées)
+        depuis plus de max_age_days jours.
+
+        Args:
+            max_age_days: Âge minimum de clôture (date de fin, sinon dernière modification)
+
+        Returns:
+            Nombre de tâches archivées
+        """
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+
+        with self._lock:
+            to_archive = [
+                task for task in self.find_by_state(*CLOSED_STATES)
+                if (task.end_date or task.updated_at) < cutoff
+            ]
+            if not to_archive:
+                return 0
+
+            # Nouveaux enregistrements pour l'archive : leur version y repart de zéro
+            for task in to_archive:
+                task.version = 0
+
+            # D'abord l'archive : une interruption laisse au pire un doublon, jamais une perte
+            self._get_archive().save_many(to_archive)
+            self.delete_many(task.id for task in to_archive)
+            return len(to_archive)
\ No newline at end of file
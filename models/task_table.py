@@ -0,0 +1,136 @@
+"""
+Vue en colonnes de l'ensemble des tâches, pour les statistiques.
+
+État et dates sont rangés dans des tableaux typés (module array) : les
+agrégats (comptage par état, tâches en retard, durée moyenne) se calculent
+sans parcourir d'objets Task. Avec NumPy installé, les colonnes sont vues
+comme des ndarray sans copie et les calculs sont vectorisés.
+"""
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from models.binary_format import NO_DATE, STATE_CODES, STATES_BY_CODE
+from models.task import Task, TaskState
+from models.timestamps import to_epoch_us
+
+try:
+    import numpy as np
+except ImportError:  # NumPy facultatif : repli sur des boucles sur les tableaux
+    np = None
+
+
+def _date_or_sentinel(value):
+    return NO_DATE if value is None else value
+
+
+class TaskTable:
+    """Colonnes ID / état / début / fin, une ligne par tâche"""
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._states = array('b')
+        self._start = array('q')
+        self._end = array('q')
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, task: Task):
+        """Ajoute une tâche ou met à jour sa ligne"""
+        state = STATE_CODES[task.state]
+        start = _date_or_sentinel(task._start_us)
+        end = _date_or_sentinel(task._end_us)
+
+        row = self._row_of.get(task.id)
+        if row is None:
+            self._row_of[task.id] = len(self._ids)
+            self._ids.append(task.id)
+            self._states.append(state)
+            self._start.append(start)
+            self._end.append(end)
+        else:
+            self._states[row] = state
+            self._start[row] = start
+            self._end[row] = end
+
+    def remove(self, task_id: str):
+        """Retire une tâche : la dernière ligne prend sa place (O(1))"""
+        row = self._row_of.pop(task_id, None)
+        if row is None:
+            return
+
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._states[row] = self._states[last]
+            self._start[row] = self._start[last]
+            self._end[row] = self._end[last]
+            self._row_of[moved_id] = row
+
+        self._ids.pop()
+        self._states.pop()
+        self._start.pop()
+        self._end.pop()
+
+    # ========== REQUÊTES ==========
+
+    def count_by_state(self) -> Dict[TaskState, int]:
+        """Nombre de tâches dans chaque état"""
+        if np is not None and self._ids:
+            counts = np.bincount(np.frombuffer(self._states, dtype=np.int8), minlength=len(STATE_CODES))
+            return {STATES_BY_CODE[code]: int(count) for code, count in enumerate(counts)}
+        return {state: self._states.count(code) for state, code in STATE_CODES.items()}
+
+    def overdue_ids(self, now: datetime, excluded_states: Iterable[TaskState]) -> List[str]:
+        """
+        IDs des tâches dont la date de fin est passée.
+
+        Args:
+            now: Date de référence
+            excluded_states: États jamais considérés en retard (ex: clôturés)
+        """
+        now_us = to_epoch_us(now)
+        excluded = [STATE_CODES[state] for state in excluded_states]
+
+        if np is not None and self._ids:
+            states = np.frombuffer(self._states, dtype=np.int8)
+            end = np.frombuffer(self._end, dtype=np.int64)
+            mask = (end != NO_DATE) & (end < now_us) & ~np.isin(states, excluded)
+            return [self._ids[row] for row in np.flatnonzero(mask)]
+
+        return [
+            self._ids[row]
+            for row, (state, end) in enumerate(zip(self._states, self._end))
+            if NO_DATE != end < now_us and state not in excluded
+        ]
+
+    def cycle_time_totals(self, states: Iterable[TaskState]) -> Tuple[float, int]:
+        """
+        Somme (en microsecondes) et nombre des durées début → fin.
+
+        Args:
+            states: États retenus (ex: réalisées)
+
+        Returns:
+            (somme, nombre) sur les tâches ayant les deux dates
+        """
+        codes = [STATE_CODES[state] for state in states]
+
+        if np is not None and self._ids:
+            state_column = np.frombuffer(self._states, dtype=np.int8)
+            start = np.frombuffer(self._start, dtype=np.int64)
+            end = np.frombuffer(self._end, dtype=np.int64)
+            mask = np.isin(state_column, codes) & (start != NO_DATE) & (end != NO_DATE)
+            durations = (end[mask] - start[mask]).astype(np.float64)
+            return float(durations.sum()), int(durations.size)
+
+        total = 0
+        count = 0
+        for state, start, end in zip(self._states, self._start, self._end):
+            if state in codes and start != NO_DATE and end != NO_DATE:
+                total += end - start
+                count += 1
+        return float(total), count
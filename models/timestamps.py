@@ -0,0 +1,36 @@
+"""
+Conversion des dates en entiers (microsecondes depuis le 1er janvier 1970).
+
+Les dates de l'application sont naïves (heure locale, datetime.now()) :
+l'entier n'est qu'un encodage compact, sans conversion de fuseau.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(value: Optional[datetime]) -> Optional[int]:
+    """datetime → microsecondes depuis EPOCH (None reste None)"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)  # Ramène à l'heure locale naïve
+    # Plus rapide qu'une division de timedelta
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def iso_to_epoch_us(text: Optional[str]) -> Optional[int]:
+    """Chaîne ISO (datetime.isoformat) → microsecondes depuis EPOCH (vide ou None → None)"""
+    if not text:
+        return None
+    return to_epoch_us(datetime.fromisoformat(text))
+
+
+def from_epoch_us(value: Optional[int]) -> Optional[datetime]:
+    """Microsecondes depuis EPOCH → datetime (None reste None)"""
+    if value is None:
+        return None
+    return EPOCH + value * MICROSECOND
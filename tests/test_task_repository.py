@@ -0,0 +1,146 @@
+"""
+Tests du TaskRepository (stockage JSON).
+
+Usage (depuis la racine du projet) :
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from models.task import Task, TaskState
+from models.task_repository import TaskRepository
+
+
+class TaskRepositoryTestCase(unittest.TestCase):
+    """Repository sur un fichier temporaire, supprimé après chaque test"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="pytasks-test-")
+        self.path = os.path.join(self.directory, "tasks.json")
+        self.repository = TaskRepository(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+class TransactionQueryTest(TaskRepositoryTestCase):
+    """Requêtes faites dans une transaction, après des changements du bloc"""
+
+    def setUp(self):
+        super().setUp()
+        self.kept = Task("Rédiger le rapport")
+        self.removed = Task("Relire le rapport")
+        self.dependent = Task("Envoyer le rapport", state=TaskState.WAITING, waiting_for=self.removed.id)
+        self.repository.save_many([self.kept, self.removed, self.dependent])
+        # Index construits avant la transaction
+        self.repository.find_by_state(TaskState.TODO)
+        self.repository.search("rapport")
+
+    def test_find_by_state_after_delete(self):
+        with self.repository.transaction():
+            self.repository.delete(self.removed.id)
+            self.assertEqual(self.repository.find_by_state(TaskState.TODO), [self.kept])
+
+    def test_search_after_delete(self):
+        with self.repository.transaction():
+            self.repository.delete(self.removed.id)
+            self.assertEqual(
+                {task.id for task in self.repository.search("rapport")},
+                {self.kept.id, self.dependent.id}
+            )
+
+    def test_find_waiting_on_after_delete(self):
+        with self.repository.transaction():
+            self.repository.delete(self.dependent.id)
+            self.assertEqual(self.repository.find_waiting_on(self.removed.id), [])
+
+    def test_find_by_state_after_save(self):
+        with self.repository.transaction():
+            self.repository.modify(self.kept, lambda task: task.close_task())
+            self.assertEqual(self.repository.find_by_state(TaskState.DONE), [self.kept])
+            self.assertEqual(self.repository.find_by_state(TaskState.TODO), [self.removed])
+
+    def test_indexes_rolled_back_with_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with self.repository.transaction():
+                self.repository.delete(self.removed.id)
+                raise RuntimeError("annulation")
+        self.assertEqual(
+            {task.id for task in self.repository.find_by_state(TaskState.TODO)},
+            {self.kept.id, self.removed.id}
+        )
+
+
+class ArchivedTaskTest(TaskRepositoryTestCase):
+    """Tâches clôturées déplacées dans l'archive"""
+
+    def setUp(self):
+        super().setUp()
+        self.active = Task("Préparer la réunion")
+        self.archived = Task("Réserver la salle")
+        self.other_archived = Task("Envoyer l'invitation")
+        for task in (self.archived, self.other_archived):
+            task.close_task()
+        self.repository.save_many([self.active, self.archived, self.other_archived])
+        # Âge négatif : toutes les tâches clôturées sont archivées
+        self.assertEqual(self.repository.archive_closed_tasks(-1), 2)
+
+    def archived_ids(self):
+        return {task.id for task in TaskRepository(self.repository.archive_path).load_all()}
+
+    def test_archived_task_listed(self):
+        self.assertEqual(self.repository.find_by_id(self.archived.id).id, self.archived.id)
+        self.assertEqual(
+            {task.id for task in self.repository.search("", TaskState.DONE)},
+            {self.archived.id, self.other_archived.id}
+        )
+
+    def test_delete_archived_task(self):
+        self.assertTrue(self.repository.delete(self.archived.id))
+        self.assertIsNone(self.repository.find_by_id(self.archived.id))
+        self.assertEqual(self.archived_ids(), {self.other_archived.id})
+        self.assertFalse(self.repository.delete(self.archived.id))
+
+    def test_delete_many_active_and_archived(self):
+        deleted = self.repository.delete_many([self.active.id, self.archived.id, "inconnue"])
+        self.assertEqual(deleted, 2)
+        self.assertEqual(self.repository.load_all(), [])
+        self.assertEqual(self.archived_ids(), {self.other_archived.id})
+
+
+class OffsetIndexTest(TaskRepositoryTestCase):
+    """Index annexe tasks.json.idx, écrit seulement sans identity map"""
+
+    def index_path(self):
+        return self.path + ".idx"
+
+    def test_not_written_with_cache(self):
+        self.repository.save(Task("Classer les factures"))
+        self.assertFalse(os.path.exists(self.index_path()))
+
+    def test_written_without_cache(self):
+        repository = TaskRepository(self.path, use_cache=False)
+        task = Task("Classer les factures")
+        repository.save(task)
+        self.assertTrue(os.path.exists(self.index_path()))
+        self.assertEqual(repository.find_by_id(task.id).title, task.title)
+
+    def test_stale_index_ignored(self):
+        uncached = TaskRepository(self.path, use_cache=False)
+        task = Task("Classer les factures")
+        uncached.save(task)
+
+        # Écriture par une instance avec identity map : l'index n'est pas régénéré
+        cached = self.repository.find_by_id(task.id)
+        self.repository.modify(cached, lambda t: t.update(title="Classer les reçus"))
+        added = Task("Payer le loyer")
+        self.repository.save(added)
+
+        self.assertEqual(uncached.find_by_id(task.id).title, "Classer les reçus")
+        self.assertEqual(uncached.find_by_id(added.id).title, added.title)
+
+
+if __name__ == "__main__":
+    unittest.main()
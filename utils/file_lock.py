@@ -0,0 +1,102 @@
+"""
+Verrou de fichier consultatif (advisory lock) entre processus.
+
+Plusieurs instances de PyTasks peuvent partager le même tasks.json :
+le verrou n'est pris que le temps d'une lecture ou d'une écriture, jamais pour
+toute la session. Le fichier de verrou contient aussi un compteur de générations,
+incrémenté avant chaque écriture : une instance sait ainsi, sans se fier aux
+dates de modification, si une autre a écrit depuis sa dernière lecture.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Largeur fixe du compteur : chaque mise à jour réécrit le fichier en entier
+GENERATION_WIDTH = 20
+
+
+class FileLock:
+    """
+    Verrou exclusif sur un fichier annexe (ex: tasks.json.lock).
+    Réentrant pour un même thread (l'appelant sérialise déjà ses threads).
+
+    Exemple:
+        with FileLock("tasks.json.lock"):
+            ...  # lecture-modification-écriture
+    """
+
+    def __init__(self, lock_path: str, retry_delay: float = 0.05):
+        self.lock_path = lock_path
+        self.retry_delay = retry_delay
+        self._fd = None
+        self._depth = 0
+        self._owner: Optional[int] = None  # Thread qui détient le verrou
+
+    def acquire(self):
+        """Bloque jusqu'à obtenir le verrou"""
+        if self._depth:
+            self._depth += 1  # Déjà pris : flock sur un second descripteur bloquerait
+            return
+
+        self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.name == "nt":
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(self.retry_delay)
+        else:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._depth = 1
+        self._owner = threading.get_ident()
+
+    def release(self):
+        """Libère le verrou"""
+        if self._fd is None:
+            return
+        self._depth -= 1
+        if self._depth:
+            return
+        try:
+            if os.name == "nt":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            self._owner = None
+
+    def is_held(self) -> bool:
+        """Indique si le thread appelant détient le verrou"""
+        return self._depth > 0 and self._owner == threading.get_ident()
+
+    def read_generation(self) -> int:
+        """Compteur de générations (verrou pris), 0 si aucune écriture"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        try:
+            return int(os.read(self._fd, GENERATION_WIDTH) or 0)
+        except ValueError:
+            return 0
+
+    def next_generation(self) -> int:
+        """Incrémente le compteur (verrou pris), avant d'écrire les données"""
+        generation = self.read_generation() + 1
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, b"%0*d" % (GENERATION_WIDTH, generation))
+        return generation
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
\ No newline at end of file
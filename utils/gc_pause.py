@@ -0,0 +1,22 @@
+"""
+Suspension temporaire du ramasse-miettes pendant les chargements massifs.
+
+Créer des centaines de milliers d'objets qui restent tous vivants déclenche
+le ramasse-miettes des dizaines de fois pour rien : on le suspend le temps
+du chargement.
+"""
+import gc
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Désactive le ramasse-miettes dans le bloc (réentrant)"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
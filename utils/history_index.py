@@ -0,0 +1,44 @@
+"""
+Index en mémoire du segment courant de l'historique (history.log).
+
+Deux accès sans relire tout le fichier :
+- repères temporels clairsemés (une entrée sur MARK_EVERY) : position à
+  partir de laquelle lire les entrées postérieures à une date ;
+- positions des entrées de chaque tâche.
+"""
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional
+
+MARK_EVERY = 64
+
+
+class HistoryIndex:
+    """Positions (octets) des entrées dans le segment courant"""
+
+    def __init__(self, mark_every: int = MARK_EVERY):
+        self.mark_every = mark_every
+        self._count = 0
+        self._mark_times: List[datetime] = []
+        self._mark_offsets: List[int] = []
+        self._offsets_by_task: Dict[str, List[int]] = {}
+
+    def add(self, offset: int, timestamp: datetime, task_id: Optional[str]):
+        """Note une entrée écrite à la position offset"""
+        if self._count % self.mark_every == 0:
+            self._mark_times.append(timestamp)
+            self._mark_offsets.append(offset)
+        self._count += 1
+
+        if task_id:
+            self._offsets_by_task.setdefault(task_id, []).append(offset)
+
+    def start_offset(self, since: datetime) -> int:
+        """Position à partir de laquelle se trouvent toutes les entrées postérieures à since"""
+        # Dernier repère strictement antérieur : les entrées entre deux repères datés de since en font partie
+        index = bisect_left(self._mark_times, since) - 1
+        return self._mark_offsets[index] if index >= 0 else 0
+
+    def task_offsets(self, task_id: str) -> List[int]:
+        """Positions des entrées concernant task_id, dans l'ordre du fichier"""
+        return list(self._offsets_by_task.get(task_id, ()))
@@ -1,60 +1,528 @@
 """
 Système de logging pour l'historique avec persistance.
+
+Les entrées sont ajoutées en fin de fichier (mode append) par paquets :
+elles sont écrites quand le tampon atteint flush_size entrées, au plus tard
+flush_interval secondes après la première entrée en attente, et à la
+fermeture (close).
+
+Le fichier tourne quand il dépasse max_bytes (ou chaque jour) : history.log
+devient history.log.1 (history.log.1.gz si compressé), etc., en gardant
+backup_count segments. En mémoire, seules les max_entries dernières entrées
+sont gardées, relues à la fin du segment courant au démarrage.
+
+Une ligne = un enregistrement JSON (date, niveau, action, tâche, message) ;
+les lignes texte des anciennes versions sont relues telles quelles.
+find() interroge le segment courant via un index (cf. utils.history_index) ;
+avec include_rotated, les segments tournés sont aussi lus, en entier.
+
+En mode background, log() ne fait que mettre l'entrée en file : mise en
+forme, console et écriture se font dans un thread dédié, vidé par close().
 """
-from datetime import datetime
-from typing import List
+from collections import deque
+from datetime import date, datetime
+from typing import Callable, Deque, Iterable, Iterator, List, Optional
+import atexit
+import gzip
+import json
 import os
+import queue
+import re
+import shutil
+import threading
+
+from utils.history_index import HistoryIndex
+
+# Politiques de synchronisation disque (fsync)
+FSYNC_NEVER = "never"        # Laisse le système écrire quand il veut (le plus rapide)
+FSYNC_ON_FLUSH = "on_flush"  # Une fois par paquet écrit
+FSYNC_ALWAYS = "always"      # À chaque entrée (écrite immédiatement, sans tampon)
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_ON_FLUSH, FSYNC_ALWAYS)
+
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _read_tail(path: str, count: int) -> List[str]:
+    """Dernières lignes (au plus count) d'un fichier, lu depuis la fin par blocs"""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        # Une ligne de plus que demandé : la première peut être incomplète
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    if position > 0:
+        lines = lines[1:]
+    return [line.strip() for line in lines[-count:]] if count else []
+
+
+def _lines_at(f, offsets: Iterable[int]) -> Iterator[bytes]:
+    """Lignes commençant aux positions données"""
+    for offset in offsets:
+        f.seek(offset)
+        yield f.readline()
+
+
+# Format texte des anciennes versions : [2024-01-31 12:00:00] [INFO] message
+_TEXT_LINE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] \[(\w+)\] (.*)$")
+
+
+class LogEntry:
+    """Entrée structurée de l'historique"""
+
+    __slots__ = ("timestamp", "level", "message", "action", "task_id")
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        level: str,
+        message: str,
+        action: Optional[str] = None,
+        task_id: Optional[str] = None
+    ):
+        """
+        Args:
+            timestamp: Date de l'entrée (à la seconde)
+            level: 'info', 'warning', 'error', 'success'
+            message: Texte affiché
+            action: Type d'action (ex: 'create', 'close'), pour filtrer
+            task_id: Tâche concernée
+        """
+        self.timestamp = timestamp
+        self.level = level.lower()
+        self.message = message
+        self.action = action
+        self.task_id = task_id
+
+    def format(self) -> str:
+        """Rendu texte (console, panneau Historique)"""
+        return f"[{self.timestamp:%Y-%m-%d %H:%M:%S}] [{self.level.upper()}] {self.message}"
+
+    def to_json(self) -> str:
+        """Une ligne du fichier"""
+        return json.dumps({
+            "ts": self.timestamp.isoformat(timespec="seconds"),
+            "level": self.level,
+            "action": self.action,
+            "task_id": self.task_id,
+            "message": self.message
+        }, ensure_ascii=False)
+
+    @classmethod
+    def parse(cls, line: str) -> Optional['LogEntry']:
+        """Relit une ligne JSON ou au format texte des anciennes versions (None si illisible)"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            if line.startswith("{"):
+                data = json.loads(line)
+                return cls(
+                    datetime.fromisoformat(data["ts"]),
+                    data["level"],
+                    data["message"],
+                    data.get("action"),
+                    data.get("task_id")
+                )
+            match = _TEXT_LINE.match(line)
+            if match:
+                timestamp, level, message = match.groups()
+                return cls(datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S"), level, message)
+        except (ValueError, KeyError, TypeError):
+            pass
+        return None
 
 
 class Logger:
     """Logger avec sauvegarde automatique dans un fichier"""
-    
-    def __init__(self, log_file: str = "history.log"):
+
+    def __init__(
+        self,
+        log_file: str = "history.log",
+        flush_interval: float = 1.0,
+        flush_size: int = 50,
+        fsync: str = FSYNC_ON_FLUSH,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = 1024 * 1024,
+        rotate_daily: bool = False,
+        backup_count: int = 5,
+        compress: bool = False,
+        background: bool = False
+    ):
+        """
+        Args:
+            log_file: Fichier de l'historique
+            flush_interval: Délai maximal (secondes) avant l'écriture d'une entrée
+            flush_size: Nombre d'entrées en attente déclenchant une écriture
+            fsync: FSYNC_NEVER, FSYNC_ON_FLUSH ou FSYNC_ALWAYS
+            max_entries: Nombre d'entrées gardées en mémoire (les plus récentes)
+            max_bytes: Taille déclenchant une rotation (None : pas de limite)
+            rotate_daily: Rotation aussi au premier paquet écrit chaque jour
+            backup_count: Nombre de segments anciens conservés
+            compress: Compresse les segments anciens (gzip)
+            background: Traite les entrées dans un thread dédié (log() ne bloque pas)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Politique fsync inconnue : {fsync}")
+
         self.log_file = log_file
-        self.logs: List[str] = []
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+        self.compress = compress
+        self.logs: Deque[LogEntry] = deque(maxlen=max_entries)
+
+        # Taille et jour du segment courant (décident de la rotation)
+        self._size = 0
+        self._segment_date = date.today()
+
+        # Entrées pas encore écrites, et écriture programmée
+        self._buffer: List[LogEntry] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self._file = None  # Ouvert en append (binaire) à la première écriture
+
+        # Index du segment courant, construit à la première requête puis tenu à jour
+        self._index: Optional[HistoryIndex] = None
+        self._lock = threading.RLock()
+
+        # Appelé pour chaque nouvelle entrée (depuis le thread d'écriture en mode background)
+        self.on_entry: Optional[Callable[[LogEntry], None]] = None
+
         self._load_logs()
-    
+
+        # File des entrées à traiter (mode background) ; None = fin du thread
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue()
+            # Démon : ne retient pas la sortie du processus ; atexit vide la file si close() n'a pas été appelé
+            self._worker = threading.Thread(target=self._process_queue, name="Logger", daemon=True)
+            self._worker.start()
+            atexit.register(self.close)
+
     def _load_logs(self):
-        """Charge les logs depuis le fichier"""
+        """Charge les dernières entrées du segment courant"""
+        self.logs.clear()
         if os.path.exists(self.log_file):
             try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    self.logs = [line.strip() for line in f.readlines()]
+                stat = os.stat(self.log_file)
+                self._size = stat.st_size
+                self._segment_date = date.fromtimestamp(stat.st_mtime)
+                entries = (LogEntry.parse(line) for line in _read_tail(self.log_file, self.logs.maxlen))
+                self.logs.extend(entry for entry in entries if entry is not None)
             except Exception as e:
                 print(f"Erreur chargement logs : {e}")
-                self.logs = []
-        else:
-            self.logs = []
-    
-    def _save_logs(self):
-        """Sauvegarde les logs dans le fichier"""
-        try:
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(self.logs) + '\n')
-        except Exception as e:
-            print(f"Erreur sauvegarde logs : {e}")
-    
-    def log(self, level: str, message: str):
+                self.logs.clear()
+
+    def log(self, level: str, message: str, action: Optional[str] = None, task_id: Optional[str] = None):
         """
         Enregistre un log.
-        
+
         Args:
             level: 'info', 'warning', 'error', 'success'
             message: Message à logger
+            action: Type d'action (ex: 'create', 'close'), optionnel
+            task_id: ID de la tâche concernée, optionnel
+        """
+        log_entry = LogEntry(datetime.now().replace(microsecond=0), level, message, action, task_id)
+        if self._worker is not None:
+            self._queue.put(log_entry)
+        else:
+            self._append(log_entry)
+
+    def _append(self, log_entry: LogEntry):
+        """Affiche l'entrée, la garde en mémoire et programme son écriture"""
+        print(log_entry.format())  # Affiche aussi en console
+
+        with self._lock:
+            self.logs.append(log_entry)
+            self._buffer.append(log_entry)
+
+            if self.fsync == FSYNC_ALWAYS or len(self._buffer) >= self.flush_size:
+                self.flush()
+            elif self._flush_timer is None:
+                # Pas de report : une entrée attend au plus flush_interval
+                self._flush_timer = threading.Timer(self.flush_interval, self._background_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if self.on_entry:
+            self.on_entry(log_entry)
+
+    def flush(self):
+        """Ajoute les entrées en attente à la fin du fichier"""
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if not self._buffer:
+                return
+
+            lines = [(entry.to_json() + '\n').encode('utf-8') for entry in self._buffer]
+            size = sum(len(line) for line in lines)
+            try:
+                if self._should_rotate(size):
+                    self._rotate()
+                if self._file is None:
+                    self._file = open(self.log_file, 'ab')  # Binaire : positions exactes en octets
+                self._file.write(b"".join(lines))
+                self._file.flush()
+                if self.fsync != FSYNC_NEVER:
+                    os.fsync(self._file.fileno())
+
+                if self._index is not None:
+                    offset = self._size
+                    for entry, line in zip(self._buffer, lines):
+                        self._index.add(offset, entry.timestamp, entry.task_id)
+                        offset += len(line)
+                self._size += size
+                self._buffer.clear()
+            except Exception as e:
+                # Les entrées restent en attente pour la prochaine écriture
+                print(f"Erreur sauvegarde logs : {e}")
+
+    # ========== ROTATION ==========
+
+    def _should_rotate(self, incoming: int) -> bool:
+        """Le segment courant doit-il être fermé avant d'écrire incoming octets ?"""
+        if self._size == 0:
+            return False
+        if self.rotate_daily and self._segment_date != date.today():
+            return True
+        return self.max_bytes is not None and self._size + incoming > self.max_bytes
+
+    def _segment_path(self, index: int, compressed: bool) -> str:
+        return f"{self.log_file}.{index}" + (".gz" if compressed else "")
+
+    def _rotate(self):
+        """history.log → history.log.1 (.gz), les segments plus anciens reculent d'un rang"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        # Les deux extensions : compress a pu changer depuis la rotation précédente
+        for index in range(self.backup_count, 0, -1):
+            for compressed in (False, True):
+                source = self._segment_path(index, compressed)
+                if not os.path.exists(source):
+                    continue
+                if index == self.backup_count:
+                    os.remove(source)
+                else:
+                    os.replace(source, self._segment_path(index + 1, compressed))
+
+        if self.backup_count == 0:
+            os.remove(self.log_file)
+        elif self.compress:
+            with open(self.log_file, 'rb') as source, gzip.open(self._segment_path(1, True), 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(self.log_file)
+        else:
+            os.replace(self.log_file, self._segment_path(1, False))
+
+        self._size = 0
+        self._segment_date = date.today()
+        self._index = HistoryIndex()
+
+    def _background_flush(self):
+        """Écriture déclenchée par le timer"""
+        self.flush()
+
+    # ========== THREAD D'ÉCRITURE ==========
+
+    def _process_queue(self):
+        """Boucle du thread dédié : traite les entrées jusqu'à la sentinelle None"""
+        while True:
+            log_entry = self._queue.get()
+            try:
+                if log_entry is None:
+                    return
+                self._append(log_entry)
+            except Exception as e:
+                print(f"Erreur sauvegarde logs : {e}")
+            finally:
+                self._queue.task_done()
+
+    def _drain(self):
+        """Attend que toutes les entrées déjà mises en file soient traitées"""
+        if self._worker is not None and threading.current_thread() is not self._worker:
+            self._queue.join()
+
+    def close(self):
+        """
+        Traite les entrées encore en file, les écrit et ferme le fichier
+        (fermeture de l'application). Les log() suivants sont traités directement.
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level.upper()}] {message}"
-        self.logs.append(log_entry)
-        print(log_entry)  # Affiche aussi en console
-        
-        # Sauvegarde automatique
-        self._save_logs()
-    
+        worker = self._worker
+        if worker is not None and threading.current_thread() is not worker:
+            self._worker = None  # Nouvelles entrées traitées par l'appelant
+            self._queue.put(None)
+            worker.join()
+            atexit.unregister(self.close)
+        self._close_file()
+
+    def _close_file(self):
+        with self._lock:
+            self.flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ========== REQUÊTES ==========
+
+    def _get_index(self) -> HistoryIndex:
+        """Index du segment courant (une lecture complète au premier appel seulement)"""
+        if self._index is None:
+            index = HistoryIndex()
+            offset = 0
+            if os.path.exists(self.log_file):
+                with open(self.log_file, 'rb') as f:
+                    for line in f:
+                        entry = LogEntry.parse(line.decode('utf-8', errors='replace'))
+                        if entry is not None:
+                            index.add(offset, entry.timestamp, entry.task_id)
+                        offset += len(line)
+            self._index = index
+        return self._index
+
+    def find(
+        self,
+        level: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        task_id: Optional[str] = None,
+        action: Optional[str] = None,
+        include_rotated: bool = False
+    ) -> List[LogEntry]:
+        """
+        Entrées correspondant à tous les critères donnés, dans l'ordre chronologique.
+        Dans le segment courant, avec task_id, seules les lignes de la tâche sont
+        lues ; avec since, la lecture commence au repère temporel qui précède.
+
+        Args:
+            include_rotated: Cherche aussi dans les segments tournés (.N, .N.gz),
+                             non indexés : chacun est lu en entier, sauf ceux
+                             dont la date de modification précède since
+
+        Exemple:
+            logger.find(level="error", since=datetime.now() - timedelta(hours=1))
+        """
+        criteria = (level.lower() if level else None, since, until, task_id, action)
+
+        self._drain()
+        with self._lock:
+            self.flush()
+            results: List[LogEntry] = []
+
+            if include_rotated:
+                for path in self._rotated_segments(since):
+                    with (gzip.open if path.endswith(".gz") else open)(path, 'rb') as f:
+                        if self._collect(f, results, *criteria):
+                            return results  # until dépassé : les segments suivants sont plus récents
+
+            if not os.path.exists(self.log_file):
+                return results
+            index = self._get_index()
+
+            with open(self.log_file, 'rb') as f:
+                if task_id:
+                    lines: Iterable[bytes] = _lines_at(f, index.task_offsets(task_id))
+                else:
+                    f.seek(index.start_offset(since) if since else 0)
+                    lines = f
+                self._collect(lines, results, *criteria)
+            return results
+
+    def _rotated_segments(self, since: Optional[datetime]) -> Iterator[str]:
+        """Segments tournés existants, du plus ancien au plus récent"""
+        for index in range(self.backup_count, 0, -1):
+            for compressed in (False, True):
+                path = self._segment_path(index, compressed)
+                if not os.path.exists(path):
+                    continue
+                # Modifié au plus tôt à sa dernière entrée : plus ancien que since, il n'a rien à donner
+                if since and os.path.getmtime(path) < since.timestamp():
+                    continue
+                yield path
+
+    @staticmethod
+    def _collect(
+        lines: Iterable[bytes],
+        results: List[LogEntry],
+        level: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        task_id: Optional[str],
+        action: Optional[str]
+    ) -> bool:
+        """
+        Ajoute à results les entrées correspondant aux critères.
+
+        Returns:
+            True si une entrée postérieure à until a été atteinte
+        """
+        for line in lines:
+            entry = LogEntry.parse(line.decode('utf-8', errors='replace'))
+            if entry is None:
+                continue
+            if until and entry.timestamp > until:
+                return True  # Entrées dans l'ordre chronologique
+            if since and entry.timestamp < since:
+                continue
+            if level and entry.level != level:
+                continue
+            if action and entry.action != action:
+                continue
+            if task_id and entry.task_id != task_id:
+                continue
+            results.append(entry)
+        return False
+
+    def get_entries(self) -> List[LogEntry]:
+        """Entrées gardées en mémoire (les plus récentes), de la plus ancienne à la plus récente"""
+        with self._lock:  # Copie : le thread d'écriture peut ajouter pendant le parcours
+            return list(self.logs)
+
     def get_all_logs(self) -> str:
         """Retourne tous les logs formatés"""
-        return "\n".join(self.logs)
-    
-    def clear(self):
-        """Efface tous les logs"""
-        self.logs.clear()
-        self._save_logs()
\ No newline at end of file
+        return "\n".join(entry.format() for entry in self.get_entries())
+
+    def clear(self) -> List[LogEntry]:
+        """
+        Efface tous les logs (segments anciens compris).
+
+        Returns:
+            Les entrées gardées en mémoire avant l'effacement : on_entry a pu
+            être appelé pour elles sans que l'abonné (ex: signal mis en file)
+            les ait encore reçues
+        """
+        self._drain()
+        with self._lock:
+            cleared = list(self.logs)
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self.logs.clear()
+            self._buffer.clear()
+            self._close_file()
+            try:
+                open(self.log_file, 'w', encoding='utf-8').close()
+                for index in range(1, self.backup_count + 1):
+                    for compressed in (False, True):
+                        path = self._segment_path(index, compressed)
+                        if os.path.exists(path):
+                            os.remove(path)
+            except Exception as e:
+                print(f"Erreur sauvegarde logs : {e}")
+            self._size = 0
+            self._segment_date = date.today()
+            self._index = HistoryIndex()
+        return cleared
@@ -15,7 +15,7 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QAbstractItemView, QApplication, QComboBox, QDateTimeEdit,
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QCheckBox, QComboBox, QDateTimeEdit,
     QFrame, QGroupBox, QHBoxLayout, QLabel,
     QLineEdit, QListWidget, QListWidgetItem, QMainWindow,
     QPushButton, QSizePolicy, QSpacerItem, QStatusBar,
@@ -57,6 +57,11 @@ class Ui_MainWindow(object):
 
         self.sidebarLayout.addWidget(self.stateFilter)
 
+        self.includeArchive = QCheckBox(self.sidebar)
+        self.includeArchive.setObjectName(u"includeArchive")
+
+        self.sidebarLayout.addWidget(self.includeArchive)
+
         self.taskList = QListWidget(self.sidebar)
         self.taskList.setObjectName(u"taskList")
 
@@ -366,6 +371,10 @@ class Ui_MainWindow(object):
 
 #if QT_CONFIG(tooltip)
         self.stateFilter.setToolTip(QCoreApplication.translate("MainWindow", u"Filtrer par \u00e9tat", None))
+#endif // QT_CONFIG(tooltip)
+        self.includeArchive.setText(QCoreApplication.translate("MainWindow", u"Inclure l'archive", None))
+#if QT_CONFIG(tooltip)
+        self.includeArchive.setToolTip(QCoreApplication.translate("MainWindow", u"Rechercher aussi dans les t\u00e2ches archiv\u00e9es", None))
 #endif // QT_CONFIG(tooltip)
 #if QT_CONFIG(tooltip)
         self.taskList.setToolTip(QCoreApplication.translate("MainWindow", u"Liste des t\u00e2ches", None))